@@ -3,6 +3,7 @@ Main entry point for the EDSP Web Scraper with clean architecture.
 """
 
 import asyncio
+import os
 import sys
 import signal
 from pathlib import Path
@@ -14,8 +15,6 @@ from src.infrastructure.logger import structured_logger
 
 async def run_sample_processing():
     """Run sample processing for testing."""
-    global scraper_instance
-
     structured_logger.bind_context(action="main_sample_start").info(
         "🧪 Starting sample processing (page 1 only)"
     )
@@ -30,7 +29,6 @@ async def run_sample_processing():
     )
 
     scraper = EDSPScraper(config)
-    scraper_instance = scraper
 
     try:
         stats = await scraper.process_sample(start_page=1, end_page=5)
@@ -59,9 +57,13 @@ async def run_sample_processing():
         )
 
         if summary["classifications"]:
-            print("\nClassifications:")
-            for classification, count in summary["classifications"].items():
-                print(f"  {classification}: {count} schools")
+            print(
+                "\nClassifications:\n"
+                + "\n".join(
+                    f"  {classification}: {count} schools"
+                    for classification, count in summary["classifications"].items()
+                )
+            )
 
         if summary["file_info"]["exists"]:
             print(f"\n📁 Results saved to: {summary['file_info']['filename']}")
@@ -75,8 +77,6 @@ async def run_sample_processing():
 
 async def run_full_processing():
     """Run full processing of all pages."""
-    global scraper_instance
-
     structured_logger.bind_context(action="main_full_start").info(
         "🚀 Starting full-scale processing of all pages (with 100 results per page)"
     )
@@ -91,7 +91,6 @@ async def run_full_processing():
     )
 
     scraper = EDSPScraper(config)
-    scraper_instance = scraper
 
     try:
         stats = await scraper.process_all_pages()
@@ -118,9 +117,13 @@ async def run_full_processing():
         print(f"Total pages: {stats.total_pages}")
 
         if summary["classifications"]:
-            print("\nClassifications:")
-            for classification, count in summary["classifications"].items():
-                print(f"  {classification}: {count} schools")
+            print(
+                "\nClassifications:\n"
+                + "\n".join(
+                    f"  {classification}: {count} schools"
+                    for classification, count in summary["classifications"].items()
+                )
+            )
 
         if summary["file_info"]["exists"]:
             print(f"\n📁 Results saved to: {summary['file_info']['filename']}")
@@ -133,41 +136,35 @@ async def run_full_processing():
         raise
 
 
-# Global variable to store the scraper instance
-scraper_instance = None
-
-
-def signal_handler(signum, frame):
-    """Handle Ctrl+C gracefully."""
-    global scraper_instance
-    if scraper_instance:
-        structured_logger.bind_context(action="graceful_shutdown").info(
-            "🛑 Received interrupt signal, saving data and shutting down gracefully..."
+def _trigger_shutdown(main_task: asyncio.Task):
+    """Cancel the main task so the scraper can save and close cleanly."""
+    if main_task.cancelling():
+        # A second Ctrl+C force-quits, in case the graceful shutdown is stuck
+        structured_logger.bind_context(action="forced_shutdown").warning(
+            "⚠️ Received second interrupt signal, exiting immediately"
         )
-        try:
-            # Force save any remaining data
-            if hasattr(scraper_instance, "storage") and scraper_instance.storage:
-                scraper_instance.storage.force_save()
-                scraper_instance.storage.close()
-
-            # Close browser contexts if available
-            if hasattr(scraper_instance, "browser_manager"):
-                structured_logger.bind_context(action="browser_cleanup").info(
-                    "🧹 Cleaning up browser contexts..."
-                )
-        except Exception as e:
-            structured_logger.bind_context(
-                action="cleanup_error", error=str(e)
-            ).warning(f"⚠️ Error during cleanup: {e}")
-    sys.exit(0)
+        os._exit(130)
+    structured_logger.bind_context(action="graceful_shutdown").info(
+        "🛑 Received interrupt signal, saving data and shutting down gracefully..."
+    )
+    main_task.cancel()
 
 
 async def main():
     """Main entry point."""
-    global scraper_instance
-
-    # Set up signal handler for graceful shutdown
-    signal.signal(signal.SIGINT, signal_handler)
+    # Cancel the running task on Ctrl+C instead of doing I/O in a signal handler
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+    try:
+        loop.add_signal_handler(signal.SIGINT, _trigger_shutdown, main_task)
+    except NotImplementedError:
+        # Windows event loops have no add_signal_handler
+        signal.signal(
+            signal.SIGINT,
+            lambda signum, frame: loop.call_soon_threadsafe(
+                _trigger_shutdown, main_task
+            ),
+        )
 
     # Create necessary directories
     Path("logs").mkdir(exist_ok=True)
@@ -183,7 +180,7 @@ async def main():
 if __name__ == "__main__":
     try:
         asyncio.run(main())
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         structured_logger.bind_context(action="user_interruption").warning(
             "⚠️ Processing interrupted by user"
         )
@@ -3,7 +3,9 @@ Main scraper application with clean architecture.
 """
 
 import asyncio
-from typing import List, Optional
+from collections import Counter
+from contextlib import AsyncExitStack
+from typing import List, Optional, Tuple
 
 from src.domain.entities import (
     SchoolData,
@@ -18,6 +20,18 @@ from src.infrastructure.browser import BrowserManager
 from src.infrastructure.storage import CSVStorage
 from src.infrastructure.logger import structured_logger
 
+# Raw rows buffered between page scraping and CSV persistence
+ROW_QUEUE_SIZE = 1024
+
+# Browser contexts kept open for the whole run and shared by all batches
+BROWSER_CONTEXTS = 4
+
+# Pause between batches when the server sends no rate-limit headers
+BATCH_PAUSE = 5.0
+
+# Weight of the newest quota reading in the remaining-quota average
+QUOTA_EMA_ALPHA = 0.5
+
 
 class EDSPScraper:
     """
@@ -37,11 +51,35 @@ class EDSPScraper:
         self.school_processor = SchoolDataProcessor()
         self.batch_processor = BatchProcessor(self.school_processor)
         self.storage = CSVStorage()
-        self.all_schools: List[SchoolData] = []
-
-    async def get_total_pages(self) -> int:
-        """Get total number of pages from the website."""
-        async for browser in self.browser_manager.get_browser_context():
+        # (total_pages, total_institutions), fetched on first use
+        self._site_counts: Optional[Tuple[int, int]] = None
+        # Running totals for the summary; rows themselves only live in the CSV
+        self._total = 0
+        self._classifications: Counter = Counter()
+        # Bound once and reused for every failed row
+        self._row_error_log = structured_logger.bind_context(
+            action="school_data_processing"
+        )
+        # Browser contexts shared by every batch of a full run
+        self._pool: Optional[AsyncExitStack] = None
+        self._browser = None
+        self._contexts: list = []
+        # Running average of the remaining rate-limit quota (0..1)
+        self._quota_ema: Optional[float] = None
+
+    async def get_site_counts(self) -> Tuple[int, int]:
+        """Get total pages and total institutions, loading the site only once."""
+        if self._site_counts is None:
+            counts = await self._fetch_site_counts()
+            # Detection failures report 0 institutions; retry those next time
+            if counts[1] <= 0:
+                return counts
+            self._site_counts = counts
+        return self._site_counts
+
+    async def _fetch_site_counts(self) -> Tuple[int, int]:
+        """Get total pages and total institutions from a single page load."""
+        async with self.browser_manager.get_browser_context() as browser:
             page = await browser.new_page()
             try:
                 await page.goto(
@@ -49,27 +87,22 @@ class EDSPScraper:
                     wait_until="domcontentloaded",
                     timeout=self.config.timeout,
                 )
-                await page.wait_for_timeout(5000)
-                return await self.browser_manager.get_total_pages(page)
-            finally:
-                await page.close()
-
-    async def get_total_institutions(self) -> int:
-        """Get total number of institutions from the website."""
-        async for browser in self.browser_manager.get_browser_context():
-            page = await browser.new_page()
-            try:
-                await page.goto(
-                    self.config.base_url,
-                    wait_until="domcontentloaded",
-                    timeout=self.config.timeout,
+                await page.wait_for_selector(
+                    self.browser_manager.READY_SELECTOR, timeout=self.config.timeout
                 )
-                await page.wait_for_timeout(5000)
-                return await self.browser_manager.get_total_institutions(page)
+                total_institutions = await self.browser_manager.get_total_institutions(
+                    page
+                )
+                total_pages = await self.browser_manager.get_total_pages(page)
+                return total_pages, total_institutions
             finally:
                 await page.close()
 
-    async def process_school_data(self, raw_data: dict) -> Optional[SchoolData]:
+    def _submit_write(self, schools: List[SchoolData]) -> asyncio.Future:
+        """Hand schools to the CSV writer thread without blocking the event loop."""
+        return asyncio.wrap_future(self.storage.submit(schools))
+
+    def process_school_data(self, raw_data: dict) -> Optional[SchoolData]:
         """Process raw school data into domain entity."""
         try:
             # Parse classification
@@ -77,33 +110,9 @@ class EDSPScraper:
                 raw_data["classification"]
             )
 
-            # Create school data
+            # Scraped keys match SchoolData fields; missing ones keep their defaults
             school_data = self.school_processor.create_school_data(
-                name=raw_data["name"],
-                classification=classification,
-                detail_url=raw_data["detail_url"],
-                teaching_directorate=raw_data.get("teaching_directorate", ""),
-                neighborhood=raw_data.get("neighborhood", ""),
-                municipality=raw_data.get("municipality", ""),
-                phone=raw_data.get("phone", ""),
-                email=raw_data.get("email", ""),
-                ideb_score_final_years=raw_data.get("ideb_score_final_years", ""),
-                idesp_score_final_years=raw_data.get("idesp_score_final_years", ""),
-                ideb_score_high_school=raw_data.get("ideb_score_high_school", ""),
-                idesp_score_high_school=raw_data.get("idesp_score_high_school", ""),
-                total_students=raw_data.get("total_students", ""),
-                age_06_10_final_years=raw_data.get("age_06_10_final_years", ""),
-                age_11_14_final_years=raw_data.get("age_11_14_final_years", ""),
-                age_15_17_final_years=raw_data.get("age_15_17_final_years", ""),
-                age_18_plus_final_years=raw_data.get("age_18_plus_final_years", ""),
-                age_06_10_high_school=raw_data.get("age_06_10_high_school", ""),
-                age_11_14_high_school=raw_data.get("age_11_14_high_school", ""),
-                age_15_17_high_school=raw_data.get("age_15_17_high_school", ""),
-                age_18_plus_high_school=raw_data.get("age_18_plus_high_school", ""),
-                total_classes=raw_data.get("total_classes", ""),
-                classes_final_years=raw_data.get("classes_final_years", ""),
-                classes_high_school=raw_data.get("classes_high_school", ""),
-                total_classrooms=raw_data.get("total_classrooms", ""),
+                {**raw_data, "classification": classification}
             )
 
             # Update stats
@@ -112,83 +121,189 @@ class EDSPScraper:
             return school_data
 
         except Exception as e:
-            structured_logger.log_error(e, "school_data_processing")
+            self._row_error_log.error(f"❌ Error occurred: {type(e).__name__}: {e}")
             self.school_processor.update_stats_error()
 
             # Create error school data
             return self.school_processor.create_school_data(
-                name="",
-                classification=SchoolClassification("UNKNOWN"),
-                detail_url=raw_data.get("detail_url", ""),
+                {
+                    "name": "",
+                    "classification": SchoolClassification.UNKNOWN,
+                    "detail_url": raw_data.get("detail_url", ""),
+                },
                 status=ProcessingStatus.ERROR,
                 error_message=str(e),
             )
 
-    async def process_batch(self, batch_config: BatchConfig) -> ProcessingStats:
-        """Process a single batch of pages."""
+    async def _ensure_pool(self) -> list:
+        """Launch the browser contexts once and reuse them across batches."""
+        if self._browser is not None and not self._browser.is_connected():
+            structured_logger.bind_context(action="browser_pool_restart").warning(
+                "⚠️ Browser disconnected, starting a new context pool"
+            )
+            await self._close_pool()
+
+        if self._pool is None:
+            pool = AsyncExitStack()
+            self._browser, self._contexts = await pool.enter_async_context(
+                self.browser_manager.create_browser_contexts(BROWSER_CONTEXTS)
+            )
+            self._pool = pool
+
+        return self._contexts
+
+    async def _close_pool(self):
+        """Close the shared browser contexts, if any were launched."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            self._browser, self._contexts = None, []
+            await pool.aclose()
+
+    def _record(self, school_data: SchoolData):
+        """Count a processed school towards the summary totals."""
+        self._total += 1
+        if school_data.status == ProcessingStatus.SUCCESS:
+            self._classifications[school_data.classification] += 1
+
+    def _batch_pause(self) -> float:
+        """Seconds to wait before the next batch, from rate-limit headers."""
+        retry_after, quota_ratio = self.browser_manager.pop_rate_limit()
+        if retry_after is not None:
+            return retry_after
+        if quota_ratio is None:
+            return BATCH_PAUSE
+
+        if self._quota_ema is None:
+            self._quota_ema = quota_ratio
+        else:
+            self._quota_ema += QUOTA_EMA_ALPHA * (quota_ratio - self._quota_ema)
+        return max(0.0, BATCH_PAUSE * (1 - self._quota_ema))
+
+    async def _save_on_interrupt(self):
+        """Drain queued writes and sync the CSV after a shutdown request."""
+        structured_logger.bind_context(action="graceful_shutdown").warning(
+            "🛑 Processing cancelled, saving written data before exit..."
+        )
+        try:
+            await asyncio.to_thread(self.storage.drain)
+            await asyncio.to_thread(self.storage.force_save)
+        except Exception as save_error:
+            structured_logger.bind_context(
+                action="emergency_save_error", error=str(save_error)
+            ).error(f"❌ Failed to save data during shutdown: {save_error}")
+
+    @staticmethod
+    def _report_write_error(write: asyncio.Future):
+        """Log a failed CSV write whose result nobody is waiting for."""
+        if not write.cancelled() and write.exception() is not None:
+            error = write.exception()
+            structured_logger.bind_context(
+                action="csv_write_error", error=str(error)
+            ).error(f"❌ Failed to write schools to CSV: {error}")
+
+    async def _consume_rows(self, rows: asyncio.Queue) -> int:
+        """Convert queued raw rows into schools and save them in chunks."""
+        saved = 0
+        pending: List[SchoolData] = []
+        writes: List[asyncio.Future] = []
+
+        try:
+            while (raw_data := await rows.get()) is not None:
+                school_data = self.process_school_data(raw_data)
+                if school_data:
+                    saved += 1
+                    self._record(school_data)
+                    pending.append(school_data)
+
+                    if len(pending) >= self.config.write_chunk_size:
+                        writes.append(self._submit_write(pending))
+                        pending = []
+        except asyncio.CancelledError:
+            # Hand the partial chunk to the writer so the interrupt drain saves it
+            if pending:
+                writes.append(self._submit_write(pending))
+            # Nobody awaits these any more, so report their failures here
+            for write in writes:
+                write.add_done_callback(self._report_write_error)
+            raise
+
+        if pending:
+            writes.append(self._submit_write(pending))
+
+        # Make sure every chunk is on disk before reporting it as saved
+        await asyncio.gather(*writes)
+
+        return saved
+
+    async def process_batch(
+        self, batch_config: BatchConfig, contexts: list
+    ) -> ProcessingStats:
+        """Process a single batch of pages on the shared browser contexts."""
         structured_logger.log_processing_start(
             batch_config.batch_name, batch_config.start_page, batch_config.end_page
         )
+        self.school_processor.start_batch()
 
-        batch_schools: List[SchoolData] = []
+        # Calculate pages to process
+        end_page = min(batch_config.end_page, self.school_processor.stats.total_pages)
+        pages_to_process = list(range(batch_config.start_page, end_page + 1))
 
-        async for browser, contexts in self.browser_manager.create_browser_contexts(4):
-            # Calculate pages to process
-            end_page = min(
-                batch_config.end_page, self.school_processor.stats.total_pages
-            )
-            pages_to_process = list(range(batch_config.start_page, end_page + 1))
+        structured_logger.bind_context(
+            action="batch_processing",
+            batch_name=batch_config.batch_name,
+            pages=pages_to_process,
+        ).info(f"🔄 Processing pages: {pages_to_process}")
+
+        # Page tasks produce raw rows while a single consumer converts and
+        # saves them, so persistence overlaps with scraping
+        rows: asyncio.Queue = asyncio.Queue(maxsize=ROW_QUEUE_SIZE)
 
+        # A free context is taken before each page task is created and handed
+        # back when it ends, so pending tasks stay bounded and each context
+        # works on at most one listing page at a time
+        free_contexts: asyncio.Queue = asyncio.Queue()
+        for context in contexts[: self.config.max_concurrent]:
+            free_contexts.put_nowait(context)
+
+        async def run_page(page_num: int, context):
+            try:
+                page_results = await self.browser_manager.process_page_parallel(
+                    page_num, context
+                )
+                for raw_data in page_results:
+                    await rows.put(raw_data)
+            finally:
+                free_contexts.put_nowait(context)
+
+        async with asyncio.TaskGroup() as tg:
+            consumer = tg.create_task(self._consume_rows(rows))
+            async with asyncio.TaskGroup() as producers:
+                for page_num in pages_to_process:
+                    context = await free_contexts.get()
+                    producers.create_task(run_page(page_num, context))
+            await rows.put(None)
+
+        batch_saved = consumer.result()
+
+        if batch_saved and structured_logger.is_enabled_for("INFO"):
             structured_logger.bind_context(
-                action="batch_processing",
-                batch_name=batch_config.batch_name,
-                pages=pages_to_process,
-            ).info(f"🔄 Processing pages: {pages_to_process}")
-
-            # Process pages in parallel using multiple contexts
-            all_tasks = []
-            for i, page_num in enumerate(pages_to_process):
-                context = contexts[i % len(contexts)]
-                task = self.browser_manager.process_page_parallel(page_num, context)
-                all_tasks.append(task)
-
-            if all_tasks:
-                all_results = await asyncio.gather(*all_tasks, return_exceptions=True)
-
-                # Process results
-                for page_results in all_results:
-                    if isinstance(page_results, list):
-                        for raw_data in page_results:
-                            school_data = await self.process_school_data(raw_data)
-                            if school_data:
-                                batch_schools.append(school_data)
-                                self.all_schools.append(school_data)
-
-                                # Save each school immediately for maximum safety
-                                self.storage.write_single_school(school_data)
-
-                # No need to save again - already saved individually
-                if batch_schools:
-                    structured_logger.bind_context(
-                        action="immediate_save",
-                        schools_saved=len(batch_schools),
-                        total_saved=len(self.all_schools),
-                    ).info(f"💾 Saved {len(batch_schools)} schools individually")
+                action="immediate_save",
+                schools_saved=batch_saved,
+                total_saved=self._total,
+            ).info("💾 Saved {} schools in chunks", batch_saved)
 
-                # Update batch stats
-                self.school_processor.stats.pages_processed += len(pages_to_process)
+        # Update batch stats
+        self.school_processor.stats.pages_processed += len(pages_to_process)
 
         # Log batch completion
         structured_logger.bind_context(
             action="batch_completed",
             batch_name=batch_config.batch_name,
-            schools_processed=len(batch_schools),
+            schools_processed=batch_saved,
             total_processed=self.school_processor.stats.total_processed,
             successful=self.school_processor.stats.successful,
             errors=self.school_processor.stats.errors,
-        ).info(
-            f"✅ Batch {batch_config.batch_name} completed: {len(batch_schools)} schools"
-        )
+        ).info(f"✅ Batch {batch_config.batch_name} completed: {batch_saved} schools")
 
         return self.school_processor.stats
 
@@ -206,8 +321,7 @@ class EDSPScraper:
 
         try:
             # Get total pages and institutions
-            total_pages = await self.get_total_pages()
-            total_institutions = await self.get_total_institutions()
+            total_pages, total_institutions = await self.get_site_counts()
             self.school_processor.stats.total_pages = total_pages
             self.school_processor.stats.total_institutions = total_institutions
 
@@ -219,43 +333,51 @@ class EDSPScraper:
                 f"📊 Total institutions to process: {total_institutions} across {total_pages} pages"
             )
 
-            # Create batches
-            batches = self.batch_processor.create_batches(total_pages, batch_size=12)
+            # Create batches lazily; only their count is needed up front
+            batch_size = 12
+            batch_count = self.batch_processor.count_batches(total_pages, batch_size)
+            batches = self.batch_processor.create_batches(total_pages, batch_size)
 
             # Process batches
             for i, batch_config in enumerate(batches, 1):
-                batch_stats = await self.process_batch(batch_config)
+                contexts = await self._ensure_pool()
+                batch_stats = await self.process_batch(batch_config, contexts)
 
                 # Merge stats
                 self.batch_processor.merge_stats(batch_stats)
 
                 # Log progress
-                self.batch_processor.log_progress(i, len(batches))
+                self.batch_processor.log_progress(i, batch_count)
 
                 # Pause between batches
-                if i < len(batches):
+                if i < batch_count:
+                    pause = self._batch_pause()
                     structured_logger.bind_context(
-                        action="batch_pause", next_batch=batch_config.batch_name
-                    ).info("⏳ Pausing 5 seconds before next batch...")
-                    await asyncio.sleep(5)
+                        action="batch_pause",
+                        next_batch=batch_config.batch_name,
+                        pause=pause,
+                    ).info(f"⏳ Pausing {pause:.1f} seconds before next batch...")
+                    await asyncio.sleep(pause)
 
-            # No need to write again - already saved individually in batches
+            # No need to write again - already saved page by page in batches
 
             # Log final stats
             self.batch_processor.log_final_stats()
 
             structured_logger.log_completion(
-                len(self.all_schools), self.batch_processor.stats.success_rate
+                self._total, self.batch_processor.stats.success_rate
             )
 
             return self.batch_processor.stats
 
+        except asyncio.CancelledError:
+            await self._save_on_interrupt()
+            raise
         except Exception as e:
             structured_logger.log_error(e, "full_processing")
             # Force save any data before raising
             try:
-                if hasattr(self, "storage") and self.storage:
-                    self.storage.force_save()
+                self.storage.force_save()
             except Exception as save_error:
                 structured_logger.bind_context(
                     action="emergency_save_error", error=str(save_error)
@@ -263,8 +385,14 @@ class EDSPScraper:
             raise
         finally:
             try:
-                if hasattr(self, "storage") and self.storage:
-                    self.storage.close()
+                await self._close_pool()
+                await self.browser_manager.close()
+            except Exception as pool_error:
+                structured_logger.bind_context(
+                    action="browser_pool_close_error", error=str(pool_error)
+                ).warning(f"⚠️ Error closing browser contexts: {pool_error}")
+            try:
+                self.storage.close()
             except Exception as close_error:
                 structured_logger.bind_context(
                     action="storage_close_error", error=str(close_error)
@@ -286,8 +414,7 @@ class EDSPScraper:
 
         try:
             # Get total pages and institutions
-            total_pages = await self.get_total_pages()
-            total_institutions = await self.get_total_institutions()
+            total_pages, total_institutions = await self.get_site_counts()
             self.school_processor.stats.total_pages = total_pages
             self.school_processor.stats.total_institutions = total_institutions
 
@@ -305,9 +432,11 @@ class EDSPScraper:
             structured_logger.log_processing_start("SAMPLE", 1, 1)
 
             batch_schools: List[SchoolData] = []
+            sample_stats = ProcessingStats()
 
-            async for browser, contexts in self.browser_manager.create_browser_contexts(
-                2
+            async with self.browser_manager.create_browser_contexts(2) as (
+                browser,
+                contexts,
             ):
                 # Process only the sample page (always page 1)
                 page_num = 1
@@ -325,49 +454,43 @@ class EDSPScraper:
 
                 if isinstance(page_results, list):
                     for raw_data in page_results:
-                        school_data = await self.process_school_data(raw_data)
+                        school_data = self.process_school_data(raw_data)
                         if school_data:
                             batch_schools.append(school_data)
-                            self.all_schools.append(school_data)
+                            self._record(school_data)
+                            if school_data.status == ProcessingStatus.SUCCESS:
+                                sample_stats.update_success()
+                            elif school_data.status == ProcessingStatus.ERROR:
+                                sample_stats.update_error()
 
-                            # Save each school immediately
-                            self.storage.write_single_school(school_data)
-
-            # No need to write again - already saved individually
+                # Save the whole page in a single write, off the event loop
+                if batch_schools:
+                    await self._submit_write(batch_schools)
 
-            # Create sample stats
-            sample_stats = ProcessingStats()
-            sample_stats.total_processed = len(batch_schools)
-            sample_stats.successful = len(
-                [s for s in batch_schools if s.status == ProcessingStatus.SUCCESS]
-            )
-            sample_stats.errors = len(
-                [s for s in batch_schools if s.status == ProcessingStatus.ERROR]
-            )
+            # Complete sample stats
             sample_stats.pages_processed = 1
             sample_stats.total_institutions = total_institutions
 
             # Verify file integrity
-            if hasattr(self, "storage") and self.storage:
-                file_ok = self.storage.verify_file_integrity()
-                if not file_ok:
-                    structured_logger.bind_context(
-                        action="file_integrity_warning"
-                    ).warning("⚠️ File integrity check failed - data may be corrupted")
+            file_ok = self.storage.verify_file_integrity()
+            if not file_ok:
+                structured_logger.bind_context(action="file_integrity_warning").warning(
+                    "⚠️ File integrity check failed - data may be corrupted"
+                )
 
             # Log completion
-            structured_logger.log_completion(
-                len(self.all_schools), sample_stats.success_rate
-            )
+            structured_logger.log_completion(self._total, sample_stats.success_rate)
 
             return sample_stats
 
+        except asyncio.CancelledError:
+            await self._save_on_interrupt()
+            raise
         except Exception as e:
             structured_logger.log_error(e, "sample_processing")
             # Force save any data before raising
             try:
-                if hasattr(self, "storage") and self.storage:
-                    self.storage.force_save()
+                self.storage.force_save()
             except Exception as save_error:
                 structured_logger.bind_context(
                     action="emergency_save_error", error=str(save_error)
@@ -375,8 +498,13 @@ class EDSPScraper:
             raise
         finally:
             try:
-                if hasattr(self, "storage") and self.storage:
-                    self.storage.close()
+                await self.browser_manager.close()
+            except Exception as browser_error:
+                structured_logger.bind_context(
+                    action="browser_close_error", error=str(browser_error)
+                ).warning(f"⚠️ Error closing browser: {browser_error}")
+            try:
+                self.storage.close()
             except Exception as close_error:
                 structured_logger.bind_context(
                     action="storage_close_error", error=str(close_error)
@@ -384,17 +512,9 @@ class EDSPScraper:
 
     def get_summary(self) -> dict:
         """Get processing summary."""
-        classifications = {}
-        for school in self.all_schools:
-            if school.status == ProcessingStatus.SUCCESS:
-                classification = school.classification.value
-                classifications[classification] = (
-                    classifications.get(classification, 0) + 1
-                )
-
         return {
-            "total_schools": len(self.all_schools),
-            "classifications": classifications,
+            "total_schools": self._total,
+            "classifications": dict(self._classifications),
             "stats": self.batch_processor.stats,
             "file_info": self.storage.get_file_info(),
         }
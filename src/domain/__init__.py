@@ -6,6 +6,8 @@ from src.domain.entities import (
     ProcessingStats,
     BatchConfig,
     ScrapingConfig,
+    SCHOOL_DETAIL_FIELDS,
+    CSV_FIELDNAMES,
 )
 
 __all__ = [
@@ -15,4 +17,6 @@ __all__ = [
     "ProcessingStats",
     "BatchConfig",
     "ScrapingConfig",
+    "SCHOOL_DETAIL_FIELDS",
+    "CSV_FIELDNAMES",
 ]
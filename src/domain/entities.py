@@ -2,69 +2,121 @@
 Domain entities for the EDSP scraper.
 """
 
-from datetime import datetime
+import re
+import sys
+from operator import attrgetter
 from typing import Optional
 from dataclasses import dataclass
-from enum import Enum
+from enum import StrEnum
 
 
 class SchoolClassification:
-    """School classification types with dynamic values."""
+    """School classification values, kept as interned plain strings."""
+
+    __slots__ = ()
 
     PEI = "PEI"
     EE = "EE"
     UNKNOWN = "UNKNOWN"
 
-    def __init__(self, value: str):
-        self.value = value
-
     @classmethod
-    def from_text(cls, text: str) -> "SchoolClassification":
-        """Create classification from text, preserving original value if not PEI/EE."""
+    def from_text(cls, text: str) -> str:
+        """Parse classification from text, preserving original value if not PEI/EE."""
         if not text:
-            return cls(cls.UNKNOWN)
+            return cls.UNKNOWN
 
-        text = text.strip().upper()
+        # Values that are already canonical skip strip/upper
+        canonical = _CANONICAL_CLASSIFICATIONS.get(text)
+        if canonical is not None:
+            return canonical
 
-        if text == "PEI":
-            return cls(cls.PEI)
-        elif text == "EE":
-            return cls(cls.EE)
-        else:
-            # Preserve the original text value
-            return cls(text)
+        # Tags that start with PEI/EE (e.g. "PEI - Integral") map to them too
+        match = _CLASSIFICATION_PREFIX_RE.match(text)
+        if match:
+            return _CANONICAL_CLASSIFICATIONS[match.group(1).upper()]
 
-    def __eq__(self, other):
-        if isinstance(other, SchoolClassification):
-            return self.value == other.value
-        return False
+        # Interning makes repeated values share one string object
+        return sys.intern(text.strip().upper())
 
-    def __hash__(self):
-        return hash(self.value)
 
-    def __str__(self):
-        return self.value
+_CANONICAL_CLASSIFICATIONS = {
+    value: value
+    for value in (
+        SchoolClassification.PEI,
+        SchoolClassification.EE,
+        SchoolClassification.UNKNOWN,
+    )
+}
 
-    def __repr__(self):
-        return f"SchoolClassification('{self.value}')"
+_CLASSIFICATION_PREFIX_RE = re.compile(r"\s*(PEI|EE)\b", re.IGNORECASE)
 
 
-class ProcessingStatus(Enum):
-    """Processing status for school data."""
+class ProcessingStatus(StrEnum):
+    """Processing status for school data; members are their own CSV value."""
 
     SUCCESS = "SUCCESS"
     ERROR = "ERROR"
     SKIPPED = "SKIPPED"
 
 
-@dataclass
+# Optional detail fields scraped for each school, in CSV column order
+SCHOOL_DETAIL_FIELDS = (
+    "teaching_directorate",
+    "neighborhood",
+    "municipality",
+    "phone",
+    "email",
+    "ideb_score_final_years",
+    "idesp_score_final_years",
+    "ideb_score_high_school",
+    "idesp_score_high_school",
+    "total_students",
+    "age_06_10_final_years",
+    "age_11_14_final_years",
+    "age_15_17_final_years",
+    "age_18_plus_final_years",
+    "age_06_10_high_school",
+    "age_11_14_high_school",
+    "age_15_17_high_school",
+    "age_18_plus_high_school",
+    "total_classes",
+    "classes_final_years",
+    "classes_high_school",
+    "total_classrooms",
+)
+
+# CSV header, matching the tuples produced by SchoolData.to_csv_row
+CSV_FIELDNAMES = (
+    "school_name",
+    "classification",
+    "detail_url",
+    "extraction_timestamp",
+    "status",
+    *SCHOOL_DETAIL_FIELDS,
+    "error_message",
+)
+
+# Reads a SchoolData's attributes in CSV_FIELDNAMES order in one C call
+_CSV_ROW = attrgetter(
+    "name",
+    "classification",
+    "detail_url",
+    "extraction_timestamp",
+    "status",
+    *SCHOOL_DETAIL_FIELDS,
+    "error_message",
+)
+
+
+@dataclass(frozen=True, slots=True, eq=False, repr=False)
 class SchoolData:
     """School data entity."""
 
     name: str
-    classification: SchoolClassification
+    classification: str
     detail_url: str
-    extraction_timestamp: datetime
+    # ISO 8601 time of the batch that scraped the school, or of the cached scrape
+    extraction_timestamp: str
     status: ProcessingStatus
     teaching_directorate: str = ""
     neighborhood: str = ""
@@ -90,41 +142,16 @@ class SchoolData:
     total_classrooms: str = ""
     error_message: Optional[str] = None
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for CSV export."""
-        return {
-            "school_name": self.name,
-            "classification": self.classification.value,
-            "detail_url": self.detail_url,
-            "extraction_timestamp": self.extraction_timestamp.isoformat(),
-            "status": self.status.value,
-            "teaching_directorate": self.teaching_directorate,
-            "neighborhood": self.neighborhood,
-            "municipality": self.municipality,
-            "phone": self.phone,
-            "email": self.email,
-            "ideb_score_final_years": self.ideb_score_final_years,
-            "idesp_score_final_years": self.idesp_score_final_years,
-            "ideb_score_high_school": self.ideb_score_high_school,
-            "idesp_score_high_school": self.idesp_score_high_school,
-            "total_students": self.total_students,
-            "age_06_10_final_years": self.age_06_10_final_years,
-            "age_11_14_final_years": self.age_11_14_final_years,
-            "age_15_17_final_years": self.age_15_17_final_years,
-            "age_18_plus_final_years": self.age_18_plus_final_years,
-            "age_06_10_high_school": self.age_06_10_high_school,
-            "age_11_14_high_school": self.age_11_14_high_school,
-            "age_15_17_high_school": self.age_15_17_high_school,
-            "age_18_plus_high_school": self.age_18_plus_high_school,
-            "total_classes": self.total_classes,
-            "classes_final_years": self.classes_final_years,
-            "classes_high_school": self.classes_high_school,
-            "total_classrooms": self.total_classrooms,
-            "error_message": self.error_message or "",
-        }
-
-
-@dataclass
+    def __repr__(self) -> str:
+        return f"SchoolData({self.name!r}, status={self.status})"
+
+    def to_csv_row(self) -> tuple:
+        """Convert to a row tuple in CSV_FIELDNAMES order."""
+        # csv.writer writes a None error_message as an empty cell
+        return _CSV_ROW(self)
+
+
+@dataclass(slots=True)
 class ProcessingStats:
     """Processing statistics entity."""
 
@@ -158,8 +185,16 @@ class ProcessingStats:
         self.total_processed += 1
         self.skipped += 1
 
+    def merge(self, other: "ProcessingStats"):
+        """Add another run's processing counters to this one."""
+        self.total_processed += other.total_processed
+        self.successful += other.successful
+        self.errors += other.errors
+        self.skipped += other.skipped
+        self.pages_processed += other.pages_processed
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BatchConfig:
     """Batch processing configuration."""
 
@@ -172,7 +207,7 @@ class BatchConfig:
     delay_between_pages: float = 5.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ScrapingConfig:
     """Scraping configuration."""
 
@@ -182,6 +217,11 @@ class ScrapingConfig:
     delay_between_pages: float = 5.0
     timeout: int = 60000
     headless: bool = True
+    # Schools converted and written to the CSV per writer call
+    write_chunk_size: int = 1000
+    # Parsed detail pages are cached here across runs; None disables the cache
+    cache_dir: Optional[str] = ".scrape_cache"
+    cache_ttl: float = 7 * 24 * 3600
     base_url: str = (
         "https://transparencia.educacao.sp.gov.br/Home/MapaDeEscolasPorDiretoria"
     )
@@ -1,7 +1,15 @@
 # Infrastructure package
 
 from src.infrastructure.browser import BrowserManager
+from src.infrastructure.cache import PageCache
+from src.infrastructure.rate_limiter import RateLimiter
 from src.infrastructure.storage import CSVStorage
 from src.infrastructure.logger import structured_logger
 
-__all__ = ["BrowserManager", "CSVStorage", "structured_logger"]
+__all__ = [
+    "BrowserManager",
+    "CSVStorage",
+    "PageCache",
+    "RateLimiter",
+    "structured_logger",
+]
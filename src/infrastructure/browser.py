@@ -3,11 +3,24 @@ Browser infrastructure for web scraping with improved navigation.
 """
 
 import asyncio
-from typing import List
+import math
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from contextlib import asynccontextmanager
 
-from playwright.async_api import async_playwright, Page, BrowserContext
-from bs4 import BeautifulSoup
+import aiohttp
+from playwright.async_api import (
+    async_playwright,
+    Browser,
+    Page,
+    BrowserContext,
+    Route,
+)
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -16,59 +29,290 @@ from tenacity import (
 )
 
 from src.domain.entities import ScrapingConfig
+from src.infrastructure.cache import PageCache
 from src.infrastructure.logger import structured_logger
+from src.infrastructure.rate_limiter import RateLimiter
+
+# Brazilian phone number, e.g. "(11) 2345-6789"
+PHONE_RE = re.compile(r"\(\d{2}\)\s*\d{4,5}-?\d{4}")
+EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+# "Label: value" paragraphs, one named group per school field
+LABEL_RE = re.compile(
+    r"Diretoria de Ensino:(?P<teaching_directorate>.+)"
+    r"|Bairro:(?P<neighborhood>.+)"
+    r"|Município:(?P<municipality>.+)"
+)
+# Record total in the DataTables info line, e.g. "... de 5.574 registros"
+TOTAL_RECORDS_RE = re.compile(r"de (\d+(?:\.\d+)?) registros")
+# Only the detail-page anchors of the listing are kept when parsing it
+SCHOOL_LINK_STRAINER = SoupStrainer(
+    "a", href=lambda href: href is not None and "DetalhesEscola" in href
+)
+# Score list titles and the (IDEB, IDESP) fields they fill
+SCORE_FIELDS = {
+    "Anos finais": ("ideb_score_final_years", "idesp_score_final_years"),
+    "Ensino Médio": ("ideb_score_high_school", "idesp_score_high_school"),
+}
+SCORE_FIELD_NAMES = tuple(field for fields in SCORE_FIELDS.values() for field in fields)
+
+# Detail page selectors, relative to the content div
+NAME_SELECTOR = "h2.escola-titulo#nome-escola"
+TAG_SELECTOR = "div.tag p.tags"
+INFO_ALUNOS_SELECTOR = "div.info-alunos"
+ALUNOS_SELECTOR = "div.alunos"
+QUANTIDADE_SELECTOR = "span#quantidade-alunos"
+TOTAL_STUDENTS_SELECTOR = "div.alunos span#quantidade-alunos"
+ESCOLA_DADOS_SELECTOR = "div.escola-dados"
+ENDERECO_SELECTOR = "p#endereco-escola"
+# Score lists in order of preference: the classificacao block, then any list
+# holding score titles (so navigation menus are never parsed)
+SCORE_LIST_SELECTORS = ("div.classificacao ul", "ul:has(h2.titulo-classificacao)")
+SCORE_TITLE_SELECTOR = "h2.titulo-classificacao"
+SCORE_NOTA_SELECTORS = ("p#ideb-nota", "p#idesp-nota")
+INFRA_BOX_SELECTOR = "div.infraestrutura-escola div.infraestrutura div.box"
+INFRA_TITLE_SELECTOR = "div.titulo b#tituloInfraestrutura"
+INFRA_ITEM_SELECTOR = "div.inf ul li"
+INFRA_NUMBER_SELECTOR = "span#numeroInfraestrutura"
 
 
 class BrowserManager:
     """Browser management with improved navigation capabilities."""
 
+    # Rendered once the DataTables listing has finished initializing
+    READY_SELECTOR = "#tabelabusca_info"
+
+    # Detail page container holding every field we extract
+    CONTENT_SELECTOR = "div.conteudo"
+
+    # DataTables API calls used to jump between listing pages
+    JUMP_TO_PAGE_JS = "(n) => $('#tabelabusca').DataTable().page(n).draw('page')"
+    CURRENT_PAGE_JS = "() => $('#tabelabusca').DataTable().page() + 1"
+    TABLE_IDLE_JS = (
+        "() => { const p = document.querySelector('#tabelabusca_processing');"
+        " return !p || p.style.display === 'none'; }"
+    )
+    # Returns the school hrefs of the first selector that matches any anchors
+    SCHOOL_HREFS_JS = (
+        "(selectors) => { for (const s of selectors) {"
+        " const anchors = document.querySelectorAll(s);"
+        " if (anchors.length) return [...anchors].map((a) => a.getAttribute('href'))"
+        ".filter((h) => h && h.includes('DetalhesEscola')); }"
+        " return []; }"
+    )
+    MAX_PAGE_JS = (
+        "() => Math.max(1, ...[...document.querySelectorAll('.paginate_button')]"
+        ".map((b) => parseInt(b.textContent, 10)).filter(Number.isFinite))"
+    )
+
+    # Listing link selectors, in order of preference
+    SCHOOL_LINK_SELECTORS = (
+        "#tabelabusca tbody tr td a",
+        "table tbody tr td a",
+        ".dataTable tbody tr td a",
+    )
+    # Any table link, for when #tabelabusca itself never shows up
+    ANY_TABLE_LINK_SELECTOR = (
+        "table tbody tr td a, .dataTable tbody tr td a, tbody tr td a"
+    )
+    NEXT_BUTTON_SELECTOR = (
+        "a.paginate_button.next:not(.disabled), a.next:not(.disabled),"
+        " a[class*='next']:not(.disabled)"
+    )
+
+    # Only the HTML is parsed, so these are dropped before hitting the network
+    BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media"})
+    # Tracking hosts whose scripts and beacons add nothing to the parsed HTML
+    BLOCKED_URL_PARTS = (
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "facebook.net",
+        "facebook.com",
+        "hotjar.com",
+    )
+
+    # Bump whenever the keys returned by _parse_school_details change, so rows
+    # cached by an older parser are never fed to SchoolData
+    DETAILS_CACHE_VERSION = 1
+
+    # Schools per listing page once the page length is set to its maximum
+    LISTING_PAGE_SIZE = 100
+
     def __init__(self, config: ScrapingConfig):
         self.config = config
         self.semaphore = asyncio.Semaphore(config.max_concurrent)
+        # Single Chromium instance, launched on first use and shared by all contexts
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._browser_lock = asyncio.Lock()
+        # Keep-alive HTTP session for pages that render without JS
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        # Tightest rate-limit hints seen since the last pop_rate_limit call
+        self._retry_after: Optional[float] = None
+        self._quota_ratio: Optional[float] = None
+        # School links parsed from the listing HTML, fetched once per run
+        self._listing_links: Optional[List[str]] = None
+        self._listing_lock = asyncio.Lock()
+        # Listing totals are constant for a run, so detect them only once
+        self._total_institutions: Optional[int] = None
+        self._total_pages: Optional[int] = None
+        self._totals_lock = asyncio.Lock()
+        self._cache: Optional[PageCache] = (
+            PageCache(config.cache_dir, config.cache_ttl, self.DETAILS_CACHE_VERSION)
+            if config.cache_dir
+            else None
+        )
+        # Idle detail pages per context, reused across schools
+        self._page_pools: Dict[BrowserContext, List[Page]] = {}
+        # Up to max_concurrent school requests start per delay_between_requests,
+        # so the delay is only paid when requests actually come in too fast
+        self._limiter: Optional[RateLimiter] = (
+            RateLimiter(config.max_concurrent, config.delay_between_requests)
+            if config.delay_between_requests > 0
+            else None
+        )
+
+    def _record_rate_limit(self, response) -> None:
+        """Keep the strictest Retry-After / X-RateLimit-* hint from a response."""
+        if response is None:
+            return
+        headers = response.headers
+
+        retry_after = headers.get("retry-after", "")
+        if retry_after.isdigit():
+            self._retry_after = max(self._retry_after or 0.0, float(retry_after))
+
+        remaining = headers.get("x-ratelimit-remaining", "")
+        limit = headers.get("x-ratelimit-limit", "")
+        if remaining.isdigit() and limit.isdigit() and int(limit) > 0:
+            ratio = int(remaining) / int(limit)
+            if self._quota_ratio is None or ratio < self._quota_ratio:
+                self._quota_ratio = ratio
+
+    def pop_rate_limit(self) -> Tuple[Optional[float], Optional[float]]:
+        """Return (retry_after, quota_ratio) seen so far and reset them."""
+        hints = (self._retry_after, self._quota_ratio)
+        self._retry_after = self._quota_ratio = None
+        return hints
+
+    async def start(self) -> Browser:
+        """Launch Chromium once and share it with every caller."""
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                try:
+                    self._browser = await self._playwright.chromium.launch(
+                        headless=self.config.headless
+                    )
+                except Exception:
+                    # Don't leave the Playwright driver running without a browser
+                    playwright, self._playwright = self._playwright, None
+                    await playwright.stop()
+                    raise
+        return self._browser
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """Return the keep-alive HTTP session used for pages without JS."""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.config.max_concurrent),
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout / 1000),
+            )
+        return self._http_session
+
+    async def close(self):
+        """Close the shared browser, stop Playwright and the HTTP session."""
+        async with self._browser_lock:
+            browser, self._browser = self._browser, None
+            playwright, self._playwright = self._playwright, None
+        session, self._http_session = self._http_session, None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
 
-    async def get_browser_context(self):
-        """Get browser context for initial operations."""
-        p = await async_playwright().start()
-        browser = await p.chromium.launch(headless=self.config.headless)
         try:
-            yield browser
+            if session is not None:
+                await session.close()
+            if browser is not None:
+                await browser.close()
         finally:
-            await browser.close()
-            await p.stop()
+            if playwright is not None:
+                await playwright.stop()
+
+    @asynccontextmanager
+    async def get_browser_context(self):
+        """Get the shared browser for initial operations."""
+        yield await self.start()
 
+    @asynccontextmanager
     async def create_browser_contexts(self, count: int = 3):
-        """Create multiple browser contexts for parallel processing."""
-        p = await async_playwright().start()
-        browser = await p.chromium.launch(headless=self.config.headless)
+        """Create multiple contexts on the shared browser for parallel processing."""
+        browser = await self.start()
         contexts = []
 
-        for i in range(count):
-            context = await browser.new_context()
-            contexts.append(context)
-
         try:
+            for i in range(count):
+                context = await browser.new_context()
+                await context.route("**/*", self._block_resources)
+                contexts.append(context)
+
             yield browser, contexts
         finally:
             for context in contexts:
+                # Closing the context also closes its pooled pages
+                self._page_pools.pop(context, None)
                 await context.close()
-            await browser.close()
-            await p.stop()
+
+    async def _acquire_page(self, context: BrowserContext) -> Page:
+        """Reuse an idle page of the context, or open a new one."""
+        idle = self._page_pools.setdefault(context, [])
+        while idle:
+            page = idle.pop()
+            if not page.is_closed():
+                return page
+        return await context.new_page()
+
+    def _release_page(self, context: BrowserContext, page: Page):
+        """Return a page to its context's pool for the next school."""
+        self._page_pools.setdefault(context, []).append(page)
+
+    @classmethod
+    async def _block_resources(cls, route: Route):
+        """Abort requests for resources the scraper never reads."""
+        request = route.request
+        if request.resource_type in cls.BLOCKED_RESOURCE_TYPES or any(
+            part in request.url for part in cls.BLOCKED_URL_PARTS
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
 
     async def get_total_institutions(self, page: Page) -> int:
+        """Get total number of institutions, detecting it once per run."""
+        if self._total_institutions is None:
+            async with self._totals_lock:
+                if self._total_institutions is None:
+                    total_institutions = await self._detect_total_institutions(page)
+                    # Detection failures report 0; leave those to be retried
+                    if total_institutions <= 0:
+                        return total_institutions
+                    self._total_institutions = total_institutions
+        return self._total_institutions
+
+    async def _detect_total_institutions(self, page: Page) -> int:
         """Get total number of institutions from dataTables_info div."""
         try:
             # Wait for the dataTables_info div to be available
-            await page.wait_for_selector("#tabelabusca_info", timeout=10000)
+            await page.wait_for_selector(self.READY_SELECTOR, timeout=10000)
 
             # Get the text content
-            info_div = await page.query_selector("#tabelabusca_info")
+            info_div = await page.query_selector(self.READY_SELECTOR)
             if info_div:
                 text = await info_div.text_content()
                 if text:
                     # Extract the total number from "Mostrando de 1 até 100 de 5.574 registros"
-                    import re
-
-                    match = re.search(r"de (\d+(?:\.\d+)?) registros", text)
+                    match = TOTAL_RECORDS_RE.search(text)
                     if match:
                         total_str = match.group(1).replace(
                             ".", ""
@@ -92,25 +336,30 @@ class BrowserManager:
             return 0
 
     async def get_total_pages(self, page: Page) -> int:
+        """Get total number of pages, derived from the institution count when known."""
+        if self._total_pages is None:
+            total_institutions = await self.get_total_institutions(page)
+            if total_institutions <= 0:
+                # Without a count, fall back to reading the pagination controls
+                return await self._detect_total_pages(page)
+            self._total_pages = math.ceil(total_institutions / self.LISTING_PAGE_SIZE)
+
+            structured_logger.bind_context(
+                action="total_pages_detected",
+                total_pages=self._total_pages,
+                results_per_page=self.LISTING_PAGE_SIZE,
+            ).info(f"📈 Total pages derived from institution count: {self._total_pages}")
+        return self._total_pages
+
+    async def _detect_total_pages(self, page: Page) -> int:
         """Get total number of pages with improved detection considering 100 results per page."""
         try:
             # First, set results per page to 100
             await self.set_results_per_page(page, 100)
 
-            # Wait for the page to reload with new pagination
-            await page.wait_for_timeout(3000)
-
             # Now get the total pages with 100 results per page
             await page.wait_for_selector(".paginate_button", timeout=10000)
-            paginate_buttons = await page.query_selector_all(".paginate_button")
-
-            max_page = 1
-            for button in paginate_buttons:
-                text = await button.text_content()
-                if text and text.isdigit():
-                    page_num = int(text)
-                    if page_num > max_page:
-                        max_page = page_num
+            max_page = await page.evaluate(self.MAX_PAGE_JS)
 
             structured_logger.bind_context(
                 action="total_pages_detected",
@@ -131,9 +380,11 @@ class BrowserManager:
                 await self.set_results_per_page(page, 100)
                 return True
 
-            await page.wait_for_timeout(2000)
+            # Jump directly through the DataTables API when it is available
+            if await self._jump_to_page(page, target_page):
+                return True
 
-            # Always use sequential navigation for reliability
+            # Fall back to sequential navigation
             if target_page > 1:
                 current_page = 1
                 max_attempts = target_page + 5  # Allow some extra attempts
@@ -152,28 +403,18 @@ class BrowserManager:
                         ).info(f"✅ Successfully navigated to page {target_page}")
                         return True
 
-                    # Find the "Próximo" button with multiple selectors
-                    next_button = None
-                    next_selectors = [
-                        "a.paginate_button.next:not(.disabled)",
-                        "a.next:not(.disabled)",
-                        "a[class*='next']:not(.disabled)",
-                        "a:contains('Próximo')",
-                        "a:contains('Next')",
-                    ]
-
-                    for selector in next_selectors:
-                        try:
-                            next_button = await page.query_selector(selector)
-                            if next_button:
-                        break
-                        except:
-                            continue
+                    # Find the "Próximo" button
+                    try:
+                        next_button = await page.query_selector(
+                            self.NEXT_BUTTON_SELECTOR
+                        )
+                    except Exception:
+                        next_button = None
 
                     if next_button:
                         try:
-                        await next_button.click()
-                            await page.wait_for_timeout(3000)  # Increased wait time
+                            await next_button.click()
+                            await self._wait_for_table_idle(page)
 
                             # Verify we actually moved to the next page
                             try:
@@ -181,7 +422,7 @@ class BrowserManager:
                                 await page.wait_for_selector(
                                     "#tabelabusca", timeout=10000
                                 )
-                        current_page += 1
+                                current_page += 1
 
                                 structured_logger.bind_context(
                                     action="navigation_step",
@@ -223,7 +464,7 @@ class BrowserManager:
                 ).warning(
                     f"❌ Failed to reach page {target_page}, reached page {current_page}"
                 )
-            return False
+                return False
 
             return True
 
@@ -231,6 +472,35 @@ class BrowserManager:
             structured_logger.log_error(e, f"page_navigation_{target_page}")
             return False
 
+    async def _wait_for_table_idle(self, page: Page):
+        """Wait until DataTables has finished redrawing the listing."""
+        await page.wait_for_function(self.TABLE_IDLE_JS, timeout=self.config.timeout)
+
+    async def _jump_to_page(self, page: Page, target_page: int) -> bool:
+        """Jump to a listing page with DataTables' page().draw() API."""
+        try:
+            await page.evaluate(self.JUMP_TO_PAGE_JS, target_page - 1)
+            await self._wait_for_table_idle(page)
+            current_page = await page.evaluate(self.CURRENT_PAGE_JS)
+        except Exception as e:
+            structured_logger.bind_context(
+                action="page_jump_error", target_page=target_page, error=str(e)
+            ).warning(f"⚠️ DataTables page jump failed, clicking through: {e}")
+            return False
+
+        if current_page != target_page:
+            structured_logger.bind_context(
+                action="page_jump_mismatch",
+                target_page=target_page,
+                current_page=current_page,
+            ).warning(f"⚠️ DataTables jump landed on page {current_page}")
+            return False
+
+        structured_logger.bind_context(
+            action="navigation_success", target_page=target_page
+        ).info(f"✅ Jumped to page {target_page}")
+        return True
+
     async def set_results_per_page(self, page: Page, results_per_page: int) -> bool:
         """Set the number of results per page to reduce total pages."""
         try:
@@ -244,8 +514,8 @@ class BrowserManager:
                 "select[name='tabelabusca_length']", str(results_per_page)
             )
 
-            # Wait for the page to reload with new results
-            await page.wait_for_timeout(3000)
+            # Wait for the table to redraw with the new page length
+            await self._wait_for_table_idle(page)
 
             structured_logger.bind_context(
                 action="results_per_page_set",
@@ -276,71 +546,46 @@ class BrowserManager:
                 )
 
                 # Try alternative selectors
-                alternative_selectors = [
-                    "table tbody tr td a",
-                    ".dataTable tbody tr td a",
-                    "tbody tr td a",
-                ]
-
-                for selector in alternative_selectors:
-                    try:
-                        await page.wait_for_selector(selector, timeout=10000)
-                        break
-                    except:
-                        continue
-                else:
+                try:
+                    await page.wait_for_selector(
+                        self.ANY_TABLE_LINK_SELECTOR, timeout=10000
+                    )
+                except Exception:
                     structured_logger.bind_context(
                         action="no_links_found", page_num=page.url
                     ).warning(f"⚠️ No school links found on page")
                     return []
 
-            await page.wait_for_timeout(3000)
+            await self._wait_for_table_idle(page)
 
-            # Try multiple selectors for school links
-            school_links = []
-            selectors = [
-                "#tabelabusca tbody tr td a",
-                "table tbody tr td a",
-                ".dataTable tbody tr td a",
+            # Read every href in a single evaluate call, trying the selectors in order
+            try:
+                hrefs = await page.evaluate(
+                    self.SCHOOL_HREFS_JS, list(self.SCHOOL_LINK_SELECTORS)
+                )
+            except Exception as e:
+                structured_logger.bind_context(action="link_extraction_error").debug(
+                    f"⚠️ Error extracting links: {e}"
+                )
+                hrefs = []
+
+            # Normalize URL format
+            links = [
+                f"https://transparencia.educacao.sp.gov.br{href}"
+                if href.startswith("/")
+                else href
+                for href in hrefs
             ]
 
-            for selector in selectors:
-                try:
-                    school_links = await page.query_selector_all(selector)
-                    if school_links:
-                        break
-                except:
-                    continue
-
-            links = []
-
-            for link in school_links:
-                try:
-                href = await link.get_attribute("href")
-                if href and "DetalhesEscola" in href:
-                    # Normalize URL format
-                    if href.startswith("/"):
-                        href = f"https://transparencia.educacao.sp.gov.br{href}"
-                    links.append(href)
-                except Exception as e:
-                    structured_logger.bind_context(
-                        action="link_extraction_error"
-                    ).debug(f"⚠️ Error extracting link: {e}")
-                    continue
-
             # Remove duplicates while preserving order
-            unique_links = []
-            seen = set()
-            for link in links:
-                if link not in seen:
-                    unique_links.append(link)
-                    seen.add(link)
+            unique_links = list(dict.fromkeys(links))
 
-            structured_logger.bind_context(
-                action="links_extracted",
-                total_links=len(links),
-                unique_links=len(unique_links),
-            ).debug(f"🔗 Extracted {len(unique_links)} unique school links")
+            if structured_logger.is_enabled_for("DEBUG"):
+                structured_logger.bind_context(
+                    action="links_extracted",
+                    total_links=len(links),
+                    unique_links=len(unique_links),
+                ).debug(f"🔗 Extracted {len(unique_links)} unique school links")
 
             return unique_links
 
@@ -351,7 +596,8 @@ class BrowserManager:
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((Exception,)),
+        # Only navigation failures and timeouts are worth waiting out
+        retry=retry_if_exception_type(PlaywrightError),
         before_sleep=lambda retry_state: structured_logger.bind_context(
             action="retry_attempt", attempt=retry_state.attempt_number
         ).warning(
@@ -360,13 +606,117 @@ class BrowserManager:
     )
     async def extract_school_details(self, page: Page, detail_url: str) -> dict:
         """Extract school details with retry logic."""
-        await page.goto(
+        response = await page.goto(
             detail_url, wait_until="domcontentloaded", timeout=self.config.timeout
         )
-        await page.wait_for_timeout(2000)
+        self._record_rate_limit(response)
+        try:
+            # The content is server-rendered; this only covers late attachment
+            await page.wait_for_selector(
+                self.CONTENT_SELECTOR, state="attached", timeout=5000
+            )
+        except PlaywrightTimeoutError:
+            pass
 
-        html_content = await page.content()
-        soup = BeautifulSoup(html_content, "html.parser")
+        # Serialize only the content div over CDP, not the whole document
+        try:
+            html_content = await page.eval_on_selector(
+                self.CONTENT_SELECTOR, "element => element.outerHTML"
+            )
+        except Exception:
+            html_content = await page.content()
+
+        return self._parse_school_details(html_content, detail_url)
+
+    async def fetch_school_details(self, detail_url: str) -> Optional[dict]:
+        """Fetch and parse a detail page over plain HTTP, without a browser.
+
+        Returns None when the response lacks the school content, so the caller
+        can fall back to rendering the page in Playwright.
+        """
+        session = await self._get_http_session()
+        async with session.get(detail_url) as response:
+            self._record_rate_limit(response)
+            response.raise_for_status()
+            html_content = await response.text()
+
+        school_data = self._parse_school_details(html_content, detail_url)
+        if not school_data["name"]:
+            return None
+        return school_data
+
+    @staticmethod
+    def _parse_grade_table(table: LexborNode) -> List[Tuple[str, str, str]]:
+        """Return (label, final years, high school) text for each data row."""
+        thead = table.css_first("thead")
+        tbody = table.css_first("tbody")
+
+        # Headers come from thead, or from the first tbody row when it is missing
+        header_source = thead if thead is not None else tbody
+        header_row = (
+            header_source.css_first("tr") if header_source is not None else None
+        )
+        idx_final_years = None
+        idx_high_school = None
+        if header_row is not None:
+            for idx, th in enumerate(header_row.css("th")):
+                col = th.text(strip=True).lower()
+                if col.startswith("anos finais"):
+                    idx_final_years = idx
+                if col.startswith("ensino médio"):
+                    idx_high_school = idx
+
+        parsed_rows = []
+        data_rows = tbody.css("tr")[1:] if tbody is not None else []
+        for row in data_rows:
+            cells = row.css("td")
+            if not cells:
+                continue
+            final_years = (
+                cells[idx_final_years].text(strip=True)
+                if idx_final_years is not None and len(cells) > idx_final_years
+                else ""
+            )
+            high_school = (
+                cells[idx_high_school].text(strip=True)
+                if idx_high_school is not None and len(cells) > idx_high_school
+                else ""
+            )
+            parsed_rows.append((cells[0].text(strip=True), final_years, high_school))
+
+        return parsed_rows
+
+    @staticmethod
+    def _clean(node: LexborNode) -> str:
+        """Return the node's text, with the site's "-" placeholder as empty."""
+        text = node.text(strip=True)
+        return "" if text == "-" else text
+
+    @classmethod
+    def _parse_scores(cls, score_ul: LexborNode) -> dict:
+        """Map each titled score item of a list onto its IDEB/IDESP fields."""
+        scores = {}
+        for item in score_ul.css("li"):
+            title_element = item.css_first(SCORE_TITLE_SELECTOR)
+            if title_element is None:
+                continue
+            fields = SCORE_FIELDS.get(title_element.text(strip=True))
+            if fields is None:
+                continue
+            for selector, field in zip(SCORE_NOTA_SELECTORS, fields):
+                nota = item.css_first(selector)
+                if nota is not None:
+                    scores[field] = cls._clean(nota)
+
+        if structured_logger.is_enabled_for("DEBUG"):
+            structured_logger.bind_context(action="scores_extracted", **scores).debug(
+                f"📊 Extracted scores: {scores}"
+            )
+        return scores
+
+    def _parse_school_details(self, html_content: str, detail_url: str) -> dict:
+        """Parse the school fields out of a detail page's HTML."""
+        tree = LexborHTMLParser(html_content)
 
         school_name = ""
         classification = ""
@@ -394,499 +744,211 @@ class BrowserManager:
         total_classrooms = ""
 
         # Find the main content div
-        conteudo_div = soup.find("div", class_="conteudo")
-        if conteudo_div:
+        conteudo_div = tree.css_first(self.CONTENT_SELECTOR)
+        if conteudo_div is not None:
             # Extract school name
-            nome_element = conteudo_div.find(
-                "h2", class_="escola-titulo", id="nome-escola"
-            )
-            if nome_element:
-                school_name = nome_element.get_text(strip=True)
+            nome_element = conteudo_div.css_first(NAME_SELECTOR)
+            if nome_element is not None:
+                school_name = nome_element.text(strip=True)
 
             # Extract classification
-            tag_div = conteudo_div.find("div", class_="tag")
-            if tag_div:
-                tag_p = tag_div.find("p", class_="tags")
-                if tag_p:
-                    classification = tag_p.get_text(strip=True)
+            tag_p = conteudo_div.css_first(TAG_SELECTOR)
+            if tag_p is not None:
+                classification = tag_p.text(strip=True)
 
-                    # Extract total students and age range data
-            info_alunos_divs = conteudo_div.find_all("div", class_="info-alunos")
+            # Extract total students and age range data
+            info_alunos_divs = conteudo_div.css(INFO_ALUNOS_SELECTOR)
 
             for info_alunos_div in info_alunos_divs:
-                alunos_div = info_alunos_div.find("div", class_="alunos")
-            if alunos_div:
-                    h2_title = alunos_div.find("h2")
-                    if h2_title:
-                        title_text = h2_title.get_text(strip=True)
+                alunos_div = info_alunos_div.css_first(ALUNOS_SELECTOR)
+                if alunos_div is not None:
+                    h2_title = alunos_div.css_first("h2")
+                    if h2_title is not None:
+                        title_text = h2_title.text(strip=True)
 
                         if title_text == "Alunos":
                             # Extrair total de alunos
-                            quantidade_alunos = alunos_div.find(
-                                "span", id="quantidade-alunos"
+                            quantidade_alunos = alunos_div.css_first(
+                                QUANTIDADE_SELECTOR
                             )
-                if quantidade_alunos:
-                    total_students = quantidade_alunos.get_text(strip=True)
+                            if quantidade_alunos is not None:
+                                total_students = quantidade_alunos.text(strip=True)
 
                             # Extrair dados de faixa etária da tabela
-                            table = info_alunos_div.find("table")
-                            if table:
-                                thead = table.find("thead")
-                                header_cells = []
-                                if thead:
-                                    header_row = thead.find("tr")
-                                    if header_row:
-                                        header_cells = [
-                                            th.get_text(strip=True)
-                                            for th in header_row.find_all("th")
-                                        ]
-                                else:
-                                    # Se não houver thead, pegar do primeiro tr do tbody
-                                    tbody = table.find("tbody")
-                                    if tbody:
-                                        header_row = tbody.find("tr")
-                                        if header_row:
-                                            header_cells = [
-                                                th.get_text(strip=True)
-                                                for th in header_row.find_all("th")
-                                            ]
-                                # Mapear índices
-                                idx_final_years = None
-                                idx_high_school = None
-                                for idx, col in enumerate(header_cells):
-                                    if col.strip().lower().startswith("anos finais"):
-                                        idx_final_years = idx
-                                    if col.strip().lower().startswith("ensino médio"):
-                                        idx_high_school = idx
-                                # Pegar linhas de dados
-                                tbody = table.find("tbody")
-                                if tbody:
-                                    rows = (
-                                        tbody.find_all("tr")[1:]
-                                        if len(tbody.find_all("tr")) > 1
-                                        else []
-                                    )
-                                    for row in rows:
-                                        cells = row.find_all("td")
-                                        if len(cells) >= 1:
-                                            age_range = cells[0].get_text(strip=True)
-                                            final_years = (
-                                                cells[idx_final_years]
-                                                if idx_final_years is not None
-                                                and len(cells) > idx_final_years
-                                                else None
-                                            )
-                                            high_school = (
-                                                cells[idx_high_school]
-                                                if idx_high_school is not None
-                                                and len(cells) > idx_high_school
-                                                else None
-                                            )
-                                            final_years_val = (
-                                                final_years.get_text(strip=True)
-                                                if final_years
-                                                else ""
-                                            )
-                                            high_school_val = (
-                                                high_school.get_text(strip=True)
-                                                if high_school
-                                                else ""
-                                            )
-                                            if final_years_val == "-":
-                                                final_years_val = ""
-                                            if high_school_val == "-":
-                                                high_school_val = ""
-                                            # Mapear para variáveis
-                                            if age_range == "06 a 10 anos":
-                                                age_06_10_final_years = final_years_val
-                                                age_06_10_high_school = high_school_val
-                                            elif age_range == "11 a 14 anos":
-                                                age_11_14_final_years = final_years_val
-                                                age_11_14_high_school = high_school_val
-                                            elif age_range == "15 a 17 anos":
-                                                age_15_17_final_years = final_years_val
-                                                age_15_17_high_school = high_school_val
-                                            elif age_range == "acima dos 18 anos":
-                                                age_18_plus_final_years = (
-                                                    final_years_val
-                                                )
-                                                age_18_plus_high_school = (
-                                                    high_school_val
-                                                )
+                            table = info_alunos_div.css_first("table")
+                            if table is not None:
+                                for (
+                                    age_range,
+                                    final_years_val,
+                                    high_school_val,
+                                ) in self._parse_grade_table(table):
+                                    if final_years_val == "-":
+                                        final_years_val = ""
+                                    if high_school_val == "-":
+                                        high_school_val = ""
+                                    # Mapear para variáveis
+                                    if age_range == "06 a 10 anos":
+                                        age_06_10_final_years = final_years_val
+                                        age_06_10_high_school = high_school_val
+                                    elif age_range == "11 a 14 anos":
+                                        age_11_14_final_years = final_years_val
+                                        age_11_14_high_school = high_school_val
+                                    elif age_range == "15 a 17 anos":
+                                        age_15_17_final_years = final_years_val
+                                        age_15_17_high_school = high_school_val
+                                    elif age_range == "acima dos 18 anos":
+                                        age_18_plus_final_years = final_years_val
+                                        age_18_plus_high_school = high_school_val
 
                         elif title_text == "Total de Turmas":
                             # Extrair total de turmas
-                            quantidade_alunos = alunos_div.find(
-                                "span", id="quantidade-alunos"
+                            quantidade_alunos = alunos_div.css_first(
+                                QUANTIDADE_SELECTOR
                             )
-                            if quantidade_alunos:
-                                total_classes = quantidade_alunos.get_text(strip=True)
+                            if quantidade_alunos is not None:
+                                total_classes = quantidade_alunos.text(strip=True)
                             # Extrair dados de turmas da tabela
-                            table = info_alunos_div.find("table")
-                            if table:
-                                thead = table.find("thead")
-                                header_cells = []
-                                if thead:
-                                    header_row = thead.find("tr")
-                                    if header_row:
-                                        header_cells = [
-                                            th.get_text(strip=True)
-                                            for th in header_row.find_all("th")
-                                        ]
-                                else:
-                                    # Se não houver thead, pegar do primeiro tr do tbody
-                                    tbody = table.find("tbody")
-                                    if tbody:
-                                        header_row = tbody.find("tr")
-                                        if header_row:
-                                            header_cells = [
-                                                th.get_text(strip=True)
-                                                for th in header_row.find_all("th")
-                                            ]
-                                idx_final_years = None
-                                idx_high_school = None
-                                for idx, col in enumerate(header_cells):
-                                    if col.strip().lower().startswith("anos finais"):
-                                        idx_final_years = idx
-                                    if col.strip().lower().startswith("ensino médio"):
-                                        idx_high_school = idx
-                                # Pegar linha de dados
-                                tbody = table.find("tbody")
-                                if tbody:
-                                    data_rows = (
-                                        tbody.find_all("tr")[1:]
-                                        if len(tbody.find_all("tr")) > 1
-                                        else []
-                                    )
-                                    for row in data_rows:
-                                        cells = row.find_all("td")
-                                        if len(cells) >= 1:
-                                            final_years = (
-                                                cells[idx_final_years]
-                                                if idx_final_years is not None
-                                                and len(cells) > idx_final_years
-                                                else None
-                                            )
-                                            high_school = (
-                                                cells[idx_high_school]
-                                                if idx_high_school is not None
-                                                and len(cells) > idx_high_school
-                                                else None
-                                            )
-                                            classes_final_years = (
-                                                final_years.get_text(strip=True)
-                                                if final_years
-                                                else ""
-                                            )
-                                            classes_high_school = (
-                                                high_school.get_text(strip=True)
-                                                if high_school
-                                                else ""
-                                            )
+                            table = info_alunos_div.css_first("table")
+                            if table is not None:
+                                rows = self._parse_grade_table(table)
+                                if rows:
+                                    # The last data row holds the class counts
+                                    _, final_years_val, high_school_val = rows[-1]
+                                    classes_final_years = final_years_val
+                                    classes_high_school = high_school_val
 
             # Find escola-dados div which contains all the detailed information
-            escola_dados = conteudo_div.find("div", class_="escola-dados")
-            if escola_dados:
+            escola_dados = conteudo_div.css_first(ESCOLA_DADOS_SELECTOR)
+            if escola_dados is not None:
                 # Extract teaching directorate
-                endereco_escola = escola_dados.find("p", id="endereco-escola")
-                if endereco_escola:
-                    text = endereco_escola.get_text(strip=True)
+                endereco_escola = escola_dados.css_first(ENDERECO_SELECTOR)
+                if endereco_escola is not None:
+                    text = endereco_escola.text(strip=True)
                     if "Diretoria de Ensino:" in text:
                         teaching_directorate = text.split("Diretoria de Ensino:")[
                             1
                         ].strip()
 
+                # Walk the paragraphs once, keeping the first match for each field
+                bairro_text = municipio_text = telefone_text = email_text = None
+                for p in escola_dados.css("p"):
+                    text = p.text(strip=True)
+                    if not text:
+                        continue
+                    if bairro_text is None and "Bairro:" in text:
+                        bairro_text = text
+                    if municipio_text is None and "Município:" in text:
+                        municipio_text = text
+                    if (
+                        telefone_text is None
+                        and "(" in text
+                        and any(char.isdigit() for char in text)
+                    ):
+                        telefone_text = text
+                    if email_text is None and "@" in text:
+                        email_text = text
+
                 # Extract neighborhood
-                bairro_p = escola_dados.find(
-                    "p", string=lambda text: text and "Bairro:" in text
-                )
-                if bairro_p:
-                    text = bairro_p.get_text(strip=True)
-                    if "Bairro:" in text:
-                        neighborhood = text.split("Bairro:")[1].strip()
+                if bairro_text:
+                    neighborhood = bairro_text.split("Bairro:")[1].strip()
 
                 # Extract municipality
-                municipio_p = escola_dados.find(
-                    "p", string=lambda text: text and "Município:" in text
-                )
-                if municipio_p:
-                    text = municipio_p.get_text(strip=True)
-                    if "Município:" in text:
-                        municipality = text.split("Município:")[1].strip()
+                if municipio_text:
+                    municipality = municipio_text.split("Município:")[1].strip()
 
                 # Extract phone
-                telefone_p = escola_dados.find(
-                    "p",
-                    string=lambda text: text
-                    and any(char.isdigit() for char in text)
-                    and "(" in text,
-                )
-                if telefone_p:
+                if telefone_text:
                     # Look for phone pattern (XX) XXXXX-XXXX
-                    text = telefone_p.get_text(strip=True)
-                    import re
-
-                    phone_match = re.search(r"\(\d{2}\)\s*\d{4,5}-?\d{4}", text)
+                    phone_match = PHONE_RE.search(telefone_text)
                     if phone_match:
                         phone = phone_match.group()
 
                 # Extract email
-                email_p = escola_dados.find(
-                    "p", string=lambda text: text and "@" in text
-                )
-                if email_p:
-                    text = email_p.get_text(strip=True)
-                    # Extract email using regex
-                    import re
-
-                    email_match = re.search(
-                        r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text
-                    )
+                if email_text:
+                    email_match = EMAIL_RE.search(email_text)
                     if email_match:
                         email = email_match.group()
 
-            # Extract IDEB and IDESP scores
-            # Look for the classificacao div which contains the scores
-            classificacao_div = conteudo_div.find("div", class_="classificacao")
-            if classificacao_div:
-                structured_logger.bind_context(action="classificacao_div_found").debug(
-                    "📊 Found classificacao div"
-                )
-                # Find the ul element containing the scores
-                score_ul = classificacao_div.find("ul")
-                if score_ul:
-                    score_items = score_ul.find_all("li")
-                    structured_logger.bind_context(
-                        action="score_items_found", count=len(score_items)
-                    ).debug(f"📊 Found {len(score_items)} score items")
-                    for item in score_items:
-                        # Check if this is "Anos finais" (Final Years)
-                        title_element = item.find("h2", class_="titulo-classificacao")
-                        if title_element:
-                            title_text = title_element.get_text(strip=True)
-                            structured_logger.bind_context(
-                                action="title_found", title=title_text
-                            ).debug(f"📊 Found title: {title_text}")
-
-                            if title_text == "Anos finais":
-                                structured_logger.bind_context(
-                                    action="processing_anos_finais"
-                                ).debug("📊 Processing Anos finais scores")
-                                # Extract IDEB score for final years
-                                ideb_nota = item.find("p", id="ideb-nota")
-                                if ideb_nota:
-                                    ideb_score_final_years = ideb_nota.get_text(
-                                        strip=True
-                                    )
-                                    # Replace "-" with empty string if no data
-                                    if ideb_score_final_years == "-":
-                                        ideb_score_final_years = ""
-                                    structured_logger.bind_context(
-                                        action="ideb_extracted",
-                                        score=ideb_score_final_years,
-                                    ).debug(
-                                        f"📊 IDEB Anos finais: {ideb_score_final_years}"
-                                    )
-
-                                # Extract IDESP score for final years
-                                idesp_nota = item.find("p", id="idesp-nota")
-                                if idesp_nota:
-                                    idesp_score_final_years = idesp_nota.get_text(
-                                        strip=True
-                                    )
-                                    # Replace "-" with empty string if no data
-                                    if idesp_score_final_years == "-":
-                                        idesp_score_final_years = ""
-                                    structured_logger.bind_context(
-                                        action="idesp_extracted",
-                                        score=idesp_score_final_years,
-                                    ).debug(
-                                        f"📊 IDESP Anos finais: {idesp_score_final_years}"
-                                    )
-
-                            elif title_text == "Ensino Médio":
-                                # Extract IDEB score for high school
-                                ideb_nota = item.find("p", id="ideb-nota")
-                                if ideb_nota:
-                                    ideb_score_high_school = ideb_nota.get_text(
-                                        strip=True
-                                    )
-                                    # Replace "-" with empty string if no data
-                                    if ideb_score_high_school == "-":
-                                        ideb_score_high_school = ""
-
-                                # Extract IDESP score for high school
-                                idesp_nota = item.find("p", id="idesp-nota")
-                                if idesp_nota:
-                                    idesp_score_high_school = idesp_nota.get_text(
-                                        strip=True
-                                    )
-                                    # Replace "-" with empty string if no data
-                                    if idesp_score_high_school == "-":
-                                        idesp_score_high_school = ""
-
-            # Fallback: Look for scores in any ul element if classificacao not found
-            if (
-                not ideb_score_final_years
-                and not idesp_score_final_years
-                and not ideb_score_high_school
-                and not idesp_score_high_school
-            ):
-            score_ul = conteudo_div.find("ul")
-            if score_ul:
-                score_items = score_ul.find_all("li")
-                for item in score_items:
-                    # Check if this is "Anos finais" (Final Years)
-                    title_element = item.find("h2", class_="titulo-classificacao")
-                    if title_element:
-                        title_text = title_element.get_text(strip=True)
-
-                            if title_text == "Anos finais":
-                            # Extract IDEB score for final years
-                            ideb_nota = item.find("p", id="ideb-nota")
-                            if ideb_nota:
-                                    ideb_score_final_years = ideb_nota.get_text(
-                                        strip=True
-                                    )
-                                # Replace "-" with empty string if no data
-                                if ideb_score_final_years == "-":
-                                    ideb_score_final_years = ""
-
-                            # Extract IDESP score for final years
-                            idesp_nota = item.find("p", id="idesp-nota")
-                            if idesp_nota:
-                                idesp_score_final_years = idesp_nota.get_text(
-                                    strip=True
-                                )
-                                # Replace "-" with empty string if no data
-                                if idesp_score_final_years == "-":
-                                    idesp_score_final_years = ""
-
-                            elif title_text == "Ensino Médio":
-                            # Extract IDEB score for high school
-                            ideb_nota = item.find("p", id="ideb-nota")
-                            if ideb_nota:
-                                    ideb_score_high_school = ideb_nota.get_text(
-                                        strip=True
-                                    )
-                                # Replace "-" with empty string if no data
-                                if ideb_score_high_school == "-":
-                                    ideb_score_high_school = ""
-
-                            # Extract IDESP score for high school
-                            idesp_nota = item.find("p", id="idesp-nota")
-                            if idesp_nota:
-                                idesp_score_high_school = idesp_nota.get_text(
-                                    strip=True
-                                )
-                                # Replace "-" with empty string if no data
-                                if idesp_score_high_school == "-":
-                                    idesp_score_high_school = ""
+            # Extract IDEB and IDESP scores from the classificacao list, falling
+            # back to any titled score list only for the fields still missing
+            scores = {}
+            for selector in SCORE_LIST_SELECTORS:
+                score_ul = conteudo_div.css_first(selector)
+                if score_ul is not None:
+                    for field, value in self._parse_scores(score_ul).items():
+                        if not scores.get(field):
+                            scores[field] = value
+                    if all(scores.get(field) for field in SCORE_FIELD_NAMES):
+                        break
+            ideb_score_final_years = scores.get("ideb_score_final_years", "")
+            idesp_score_final_years = scores.get("idesp_score_final_years", "")
+            ideb_score_high_school = scores.get("ideb_score_high_school", "")
+            idesp_score_high_school = scores.get("idesp_score_high_school", "")
 
             # Fallback extraction for total students if info-alunos not found
             if not total_students:
-                alunos_div = conteudo_div.find("div", class_="alunos")
-                if alunos_div:
-                    quantidade_alunos = alunos_div.find("span", id="quantidade-alunos")
-                    if quantidade_alunos:
-                        total_students = quantidade_alunos.get_text(strip=True)
+                quantidade_alunos = conteudo_div.css_first(TOTAL_STUDENTS_SELECTOR)
+                if quantidade_alunos is not None:
+                    total_students = quantidade_alunos.text(strip=True)
 
             # Extract total classrooms from infrastructure section
-            infraestrutura_escola = conteudo_div.find(
-                "div", class_="infraestrutura-escola"
-            )
-            if infraestrutura_escola:
-                infraestrutura_div = infraestrutura_escola.find(
-                    "div", class_="infraestrutura"
-                )
-                if infraestrutura_div:
-                    boxes = infraestrutura_div.find_all("div", class_="box")
-                    for box in boxes:
-                        titulo_div = box.find("div", class_="titulo")
-                        if titulo_div:
-                            titulo_b = titulo_div.find("b", id="tituloInfraestrutura")
-                            if (
-                                titulo_b
-                                and titulo_b.get_text(strip=True) == "Salas de Aula"
-                            ):
-                                inf_div = box.find("div", class_="inf")
-                                if inf_div:
-                                    ul = inf_div.find("ul")
-                                    if ul:
-                                        li = ul.find("li")
-                                        if li:
-                                            numero_span = li.find(
-                                                "span", id="numeroInfraestrutura"
-                                            )
-                                            if numero_span:
-                                                total_classrooms = numero_span.get_text(
-                                                    strip=True
-                                                )
+            # Titles are compared exactly: other boxes can start with the same words
+            for box in conteudo_div.css(INFRA_BOX_SELECTOR):
+                titulo_b = box.css_first(INFRA_TITLE_SELECTOR)
+                if titulo_b is None or titulo_b.text(strip=True) != "Salas de Aula":
+                    continue
+                li = box.css_first(INFRA_ITEM_SELECTOR)
+                numero_span = li.css_first(INFRA_NUMBER_SELECTOR) if li else None
+                if numero_span is not None:
+                    total_classrooms = numero_span.text(strip=True)
 
             # Fallback extraction if escola-dados not found
             if not teaching_directorate or not neighborhood or not municipality:
-                # Look for information in all paragraphs
-                all_paragraphs = conteudo_div.find_all("p")
-                for p in all_paragraphs:
-                    text = p.get_text(strip=True)
-
-                    # Extract teaching directorate
-                    if "Diretoria de Ensino:" in text and not teaching_directorate:
-                        teaching_directorate = text.split("Diretoria de Ensino:")[
-                            1
-                        ].strip()
-
-                    # Extract neighborhood
-                    elif "Bairro:" in text and not neighborhood:
-                        neighborhood = text.split("Bairro:")[1].strip()
-
-                    # Extract municipality
-                    elif "Município:" in text and not municipality:
-                        municipality = text.split("Município:")[1].strip()
-
-                    # Extract phone (look for pattern)
-                    elif (
-                        "(" in text
-                        and ")" in text
-                        and any(char.isdigit() for char in text)
-                        and not phone
-                    ):
-                        import re
-
-                        phone_match = re.search(r"\(\d{2}\)\s*\d{4,5}-?\d{4}", text)
-                        if phone_match:
-                            phone = phone_match.group()
+                # Search the joined paragraph text once per pattern, keeping the
+                # first value found for each label
+                joined = "\n".join(p.text(strip=True) for p in conteudo_div.css("p"))
+                labeled = {}
+                for label_match in LABEL_RE.finditer(joined):
+                    label = label_match.lastgroup
+                    labeled.setdefault(label, label_match.group(label).strip())
+
+                if not phone:
+                    phone_match = PHONE_RE.search(joined)
+                    if phone_match:
+                        phone = phone_match.group()
 
-                    # Extract email
-                    elif "@" in text and not email:
-                        import re
+                if not email:
+                    email_match = EMAIL_RE.search(joined)
+                    if email_match:
+                        email = email_match.group()
 
-                        email_match = re.search(
-                            r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text
-                        )
-                        if email_match:
-                            email = email_match.group()
+                teaching_directorate = teaching_directorate or labeled.get(
+                    "teaching_directorate", ""
+                )
+                neighborhood = neighborhood or labeled.get("neighborhood", "")
+                municipality = municipality or labeled.get("municipality", "")
 
         # Log extracted student, class and infrastructure data for debugging
-        structured_logger.bind_context(
-            action="student_data_extracted",
-            school_name=school_name,
-            total_students=total_students,
-            total_classes=total_classes,
-            classes_final_years=classes_final_years,
-            classes_high_school=classes_high_school,
-            total_classrooms=total_classrooms,
-            age_06_10_final_years=age_06_10_final_years,
-            age_11_14_final_years=age_11_14_final_years,
-            age_15_17_final_years=age_15_17_final_years,
-            age_18_plus_final_years=age_18_plus_final_years,
-            age_06_10_high_school=age_06_10_high_school,
-            age_11_14_high_school=age_11_14_high_school,
-            age_15_17_high_school=age_15_17_high_school,
-            age_18_plus_high_school=age_18_plus_high_school,
-        ).debug(
-            f"📊 Extracted student, class and infrastructure data for {school_name}"
-        )
+        if structured_logger.is_enabled_for("DEBUG"):
+            structured_logger.bind_context(
+                action="student_data_extracted",
+                school_name=school_name,
+                total_students=total_students,
+                total_classes=total_classes,
+                classes_final_years=classes_final_years,
+                classes_high_school=classes_high_school,
+                total_classrooms=total_classrooms,
+                age_06_10_final_years=age_06_10_final_years,
+                age_11_14_final_years=age_11_14_final_years,
+                age_15_17_final_years=age_15_17_final_years,
+                age_18_plus_final_years=age_18_plus_final_years,
+                age_06_10_high_school=age_06_10_high_school,
+                age_11_14_high_school=age_11_14_high_school,
+                age_15_17_high_school=age_15_17_high_school,
+                age_18_plus_high_school=age_18_plus_high_school,
+            ).debug(
+                f"📊 Extracted student, class and infrastructure data for {school_name}"
+            )
 
         return {
             "name": school_name,
@@ -920,39 +982,150 @@ class BrowserManager:
         self, context: BrowserContext, url: str, school_num: int, total_schools: int
     ) -> dict:
         """Process a single school in parallel."""
+        if self._cache is not None:
+            cached = await asyncio.to_thread(self._cache.get, url)
+            if cached is not None:
+                school_data, stored_at = cached
+                # Report when the page was actually scraped, not this batch's time
+                scraped_at = datetime.fromtimestamp(stored_at).isoformat()
+                return {**school_data, "extraction_timestamp": scraped_at}
+
         async with self.semaphore:
-            page = await context.new_page()
+            structured_logger.bind_context(
+                action="school_processing",
+                school_num=school_num,
+                total_schools=total_schools,
+                url=url,
+            ).info(f"🏫 Processing school {school_num}/{total_schools}")
+
+            if self._limiter is not None:
+                await self._limiter.acquire()
+
+            # Detail pages are server-rendered, so plain HTTP is enough unless
+            # the response comes back without the school content
             try:
+                school_data = await self.fetch_school_details(url)
+            except Exception as e:
                 structured_logger.bind_context(
-                    action="school_processing",
-                    school_num=school_num,
-                    total_schools=total_schools,
-                    url=url,
-                ).info(f"🏫 Processing school {school_num}/{total_schools}")
+                    action="http_detail_error", url=url, error=str(e)
+                ).warning(f"⚠️ HTTP fetch failed, rendering in browser: {e}")
+                school_data = None
 
-                school_data = await self.extract_school_details(page, url)
-                await asyncio.sleep(self.config.delay_between_requests)
+            if school_data is None:
+                page = await self._acquire_page(context)
+                try:
+                    school_data = await self.extract_school_details(page, url)
+                except Exception:
+                    # Don't hand a page in an unknown state to the next school
+                    await page.close()
+                    raise
+                self._release_page(context, page)
 
-                return school_data
-            finally:
-                await page.close()
+            if self._cache is not None and school_data["name"]:
+                await asyncio.to_thread(self._cache.set, url, school_data)
 
-    async def process_page_parallel(
-        self, page_num: int, context: BrowserContext
+            return school_data
+
+    async def extract_many(
+        self, context: BrowserContext, urls: List[str]
     ) -> List[dict]:
-        """Process a single page in parallel."""
+        """Extract detail pages with a fixed pool of workers, keeping URL order."""
+        total = len(urls)
+        results: List[Optional[dict]] = [None] * total
+        # Workers share one iterator, so only max_concurrent coroutines ever exist
+        pending = enumerate(urls)
+
+        async def worker():
+            for i, url in pending:
+                try:
+                    results[i] = await self.process_school_parallel(
+                        context, url, i + 1, total
+                    )
+                except Exception as e:
+                    structured_logger.bind_context(
+                        action="school_processing_error"
+                    ).warning(f"⚠️ Error processing school: {e}")
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(self.config.max_concurrent, total)))
+        )
+        return [result for result in results if result is not None]
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError)),
+        before_sleep=lambda retry_state: structured_logger.bind_context(
+            action="retry_attempt", attempt=retry_state.attempt_number
+        ).warning(f"🔄 Retry attempt {retry_state.attempt_number} for listing fetch"),
+    )
+    async def _fetch_listing_html(self) -> str:
+        """Fetch the listing HTML over plain HTTP, with retry logic."""
+        session = await self._get_http_session()
+        async with session.get(self.config.base_url) as response:
+            self._record_rate_limit(response)
+            response.raise_for_status()
+            return await response.text()
+
+    async def fetch_listing_links(self) -> List[str]:
+        """Fetch every school link from the listing HTML without a browser."""
+        async with self._listing_lock:
+            if self._listing_links is None:
+                # The result is kept for the whole run, so every page slices the
+                # same HTML order or every page browses the DataTables order
+                try:
+                    html_content = await self._fetch_listing_html()
+                    self._listing_links = self._parse_school_links(html_content)
+                    structured_logger.bind_context(
+                        action="listing_fetched",
+                        total_links=len(self._listing_links),
+                    ).info(
+                        f"🔗 Fetched {len(self._listing_links)} school links over HTTP"
+                    )
+                except Exception as e:
+                    structured_logger.bind_context(
+                        action="listing_fetch_error", error=str(e)
+                    ).warning(
+                        f"⚠️ Could not fetch listing over HTTP, browsing every page: {e}"
+                    )
+                    self._listing_links = []
+
+        return self._listing_links
+
+    @staticmethod
+    def _parse_school_links(html_content: str) -> List[str]:
+        """Return the unique school detail links found in listing HTML."""
+        soup = BeautifulSoup(html_content, "lxml", parse_only=SCHOOL_LINK_STRAINER)
+
+        links = []
+        for anchor in soup.find_all("a"):
+            href = anchor["href"]
+            # Normalize URL format
+            if href.startswith("/"):
+                href = f"https://transparencia.educacao.sp.gov.br{href}"
+            links.append(href)
+
+        # Remove duplicates while preserving order
+        return list(dict.fromkeys(links))
+
+    async def _browse_school_links(
+        self, page_num: int, context: BrowserContext
+    ) -> List[str]:
+        """Open the listing in the browser and extract the links of one page."""
         page = await context.new_page()
-        page_results = []
 
         try:
             # Navigate to the page with better error handling
-        try:
-            await page.goto(
-                self.config.base_url,
-                wait_until="domcontentloaded",
-                timeout=self.config.timeout,
-            )
-            await page.wait_for_timeout(5000)
+            try:
+                response = await page.goto(
+                    self.config.base_url,
+                    wait_until="domcontentloaded",
+                    timeout=self.config.timeout,
+                )
+                self._record_rate_limit(response)
+                await page.wait_for_selector(
+                    self.READY_SELECTOR, timeout=self.config.timeout
+                )
             except Exception as e:
                 structured_logger.bind_context(
                     action="page_navigation_error", page_num=page_num
@@ -961,7 +1134,7 @@ class BrowserManager:
 
             # Set results per page to 100 for efficiency
             try:
-                await self.set_results_per_page(page, 100)
+                await self.set_results_per_page(page, self.LISTING_PAGE_SIZE)
             except Exception as e:
                 structured_logger.bind_context(
                     action="set_results_per_page_error", page_num=page_num
@@ -970,10 +1143,10 @@ class BrowserManager:
             # Navigate to specific page if needed
             if page_num > 1:
                 try:
-                if not await self.navigate_to_page_robust(page, page_num):
-                    structured_logger.bind_context(
-                        action="navigation_failed", page_num=page_num
-                    ).warning(f"⚠️ Could not navigate to page {page_num}")
+                    if not await self.navigate_to_page_robust(page, page_num):
+                        structured_logger.bind_context(
+                            action="navigation_failed", page_num=page_num
+                        ).warning(f"⚠️ Could not navigate to page {page_num}")
                         return []
                 except Exception as e:
                     structured_logger.bind_context(
@@ -983,13 +1156,46 @@ class BrowserManager:
 
             # Extract school links
             try:
-            school_links = await self.extract_school_links(page)
+                return await self.extract_school_links(page)
             except Exception as e:
                 structured_logger.bind_context(
                     action="link_extraction_error", page_num=page_num
                 ).warning(f"⚠️ Error extracting links from page {page_num}: {e}")
                 return []
 
+        finally:
+            try:
+                await page.close()
+            except:
+                pass
+
+    async def process_page_parallel(
+        self, page_num: int, context: BrowserContext
+    ) -> List[dict]:
+        """Process a single page in parallel."""
+        page_results = []
+
+        try:
+            # The listing HTML carries every school, so slice out this page's
+            # links and only drive the DataTables UI when that is not possible
+            listing_links = await self.fetch_listing_links()
+            start = (page_num - 1) * self.LISTING_PAGE_SIZE
+            if len(listing_links) > start:
+                school_links = listing_links[start : start + self.LISTING_PAGE_SIZE]
+            else:
+                if listing_links:
+                    # Other pages came from the HTML order, this one will follow
+                    # the DataTables sort, so schools may be skipped or repeated
+                    structured_logger.bind_context(
+                        action="listing_partial_fallback",
+                        page_num=page_num,
+                        total_links=len(listing_links),
+                    ).warning(
+                        f"⚠️ Listing HTML has only {len(listing_links)} links, "
+                        f"browsing page {page_num} in DataTables order"
+                    )
+                school_links = await self._browse_school_links(page_num, context)
+
             structured_logger.bind_context(
                 action="page_processing",
                 page_num=page_num,
@@ -997,39 +1203,16 @@ class BrowserManager:
             ).info(f"📄 Page {page_num}: Found {len(school_links)} unique schools")
 
             if school_links:
-                # Process schools in parallel with better error handling
-                tasks = []
-                for i, link in enumerate(school_links):
-                    task = self.process_school_parallel(
-                        context, link, i + 1, len(school_links)
+                try:
+                    page_results = await self.extract_many(context, school_links)
+                except Exception as e:
+                    structured_logger.bind_context(
+                        action="parallel_processing_error", page_num=page_num
+                    ).warning(
+                        f"⚠️ Error in parallel processing for page {page_num}: {e}"
                     )
-                    tasks.append(task)
-
-                if tasks:
-                    try:
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                    for result in results:
-                        if isinstance(result, dict):
-                            page_results.append(result)
-                            elif isinstance(result, Exception):
-                                structured_logger.bind_context(
-                                    action="school_processing_error"
-                                ).warning(f"⚠️ Error processing school: {result}")
-                    except Exception as e:
-                        structured_logger.bind_context(
-                            action="parallel_processing_error", page_num=page_num
-                        ).warning(
-                            f"⚠️ Error in parallel processing for page {page_num}: {e}"
-                        )
 
         except Exception as e:
             structured_logger.log_error(e, f"page_processing_{page_num}")
 
-        finally:
-            try:
-            await page.close()
-            except:
-                pass
-
         return page_results
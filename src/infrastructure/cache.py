@@ -0,0 +1,67 @@
+"""
+Persistent cache for scraped pages, so re-runs skip work already done.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from src.infrastructure.logger import structured_logger
+
+
+class PageCache:
+    """SQLite-backed URL cache for parsed page results with a TTL.
+
+    Entries live in a table named after `version`, so bumping it when the
+    shape of the cached results changes leaves older entries unread.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float, version: int = 1):
+        self.ttl = ttl
+        self._table = f"pages_v{int(version)}"
+        path = Path(cache_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        # Callers run the queries in worker threads, one at a time via the lock
+        self._conn = sqlite3.connect(path / "pages.sqlite", check_same_thread=False)
+        self._lock = threading.Lock()
+        # WAL keeps the per-entry commits cheap while the scraper is running
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._table} ("
+            "url TEXT PRIMARY KEY, stored_at REAL NOT NULL, data TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Tuple[Any, float]]:
+        """Return (result, stored_at) for a URL, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT stored_at, data FROM {self._table} WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+        return json.loads(row[1]), row[0]
+
+    def set(self, url: str, data: Any):
+        """Store the result for a URL."""
+        payload = json.dumps(data, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self._table} (url, stored_at, data)"
+                " VALUES (?, ?, ?)",
+                (url, time.time(), payload),
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the cache database."""
+        try:
+            with self._lock:
+                self._conn.close()
+        except sqlite3.Error as e:
+            structured_logger.log_error(e, "cache_close")
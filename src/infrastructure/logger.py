@@ -2,9 +2,9 @@
 Structured logging infrastructure with context binding.
 """
 
+import os
 import sys
 from typing import Dict, Any
-from contextvars import ContextVar
 from loguru import logger
 from datetime import datetime
 
@@ -13,18 +13,21 @@ class StructuredLogger:
     """Structured logger with context binding capabilities."""
 
     def __init__(self):
-        self._context: ContextVar[Dict[str, Any]] = ContextVar("context", default={})
         self._setup_logger()
 
     def _setup_logger(self):
         """Configure logger with structured format."""
         logger.remove()
 
+        console_level = "INFO"
+        # Per-school DEBUG records are opt-in, e.g. EDSP_LOG_LEVEL=DEBUG
+        file_level = os.environ.get("EDSP_LOG_LEVEL", "INFO").upper()
+
         # Console output with structured format
         logger.add(
             sys.stdout,
             format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | {message}",
-            level="INFO",
+            level=console_level,
             colorize=True,
         )
 
@@ -32,18 +35,30 @@ class StructuredLogger:
         logger.add(
             "logs/edsp_scraper_{time}.log",
             format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {extra[context]} | {message}",
-            level="DEBUG",
+            level=file_level,
             rotation="1 day",
             retention="7 days",
             compression="zip",
+            # Write from a background thread so disk I/O never blocks the event loop
+            enqueue=True,
+            backtrace=False,
+            diagnose=False,
+            buffering=1 << 16,
+        )
+
+        # Lowest level any sink emits, used to skip work for discarded records
+        self._min_level_no = min(
+            logger.level(console_level).no, logger.level(file_level).no
         )
 
+    def is_enabled_for(self, level: str) -> bool:
+        """Check whether records at the given level reach any sink."""
+        return logger.level(level).no >= self._min_level_no
+
     def bind_context(self, **kwargs):
         """Bind context variables to the logger."""
-        current_context = self._context.get()
-        current_context.update(kwargs)
-        self._context.set(current_context)
-        return logger.bind(context=str(current_context))
+        # Each record carries only its own keys; loguru formats them if emitted
+        return logger.bind(context=kwargs)
 
     def log_processing_start(self, batch_name: str, start_page: int, end_page: int):
         """Log processing start with context."""
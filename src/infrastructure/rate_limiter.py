@@ -0,0 +1,31 @@
+"""
+Token-bucket rate limiter shared by the concurrent school requests.
+"""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Allow at most `rate` acquisitions per `period` seconds, with bursts."""
+
+    def __init__(self, rate: float, period: float):
+        self.rate = rate
+        self.period = period
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                refill = (now - self._updated) * self.rate / self.period
+                self._tokens = min(self.rate, self._tokens + refill)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
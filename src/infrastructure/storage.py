@@ -3,14 +3,20 @@ Storage infrastructure for CSV file management.
 """
 
 import csv
+import os
+import queue
 import threading
+from concurrent.futures import Future
 from typing import List, Optional
 from datetime import datetime
 from pathlib import Path
 
-from src.domain.entities import SchoolData
+from src.domain.entities import CSV_FIELDNAMES, SchoolData
 from src.infrastructure.logger import structured_logger
 
+# Rows are flushed in batches, so a large buffer keeps write syscalls rare
+CSV_BUFFER_SIZE = 1 << 20
+
 
 class CSVStorage:
     """CSV storage manager for school data."""
@@ -19,9 +25,12 @@ class CSVStorage:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.filename: Optional[str] = None
-        self._csv_writer: Optional[csv.DictWriter] = None
+        self._csv_writer = None
         self._csv_file = None
         self._write_lock = threading.Lock()
+        # Chunks of schools waiting for the background writer thread
+        self._queue: queue.Queue = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
 
     def initialize_csv(self, filename: Optional[str] = None) -> str:
         """Initialize CSV file for writing."""
@@ -32,40 +41,20 @@ class CSVStorage:
         self.filename = self.output_dir / filename
 
         # Create CSV file with headers
-        self._csv_file = open(self.filename, "w", newline="", encoding="utf-8")
-        fieldnames = [
-            "school_name",
-            "classification",
-            "detail_url",
-            "extraction_timestamp",
-            "status",
-            "teaching_directorate",
-            "neighborhood",
-            "municipality",
-            "phone",
-            "email",
-            "ideb_score_final_years",
-            "idesp_score_final_years",
-            "ideb_score_high_school",
-            "idesp_score_high_school",
-            "total_students",
-            "age_06_10_final_years",
-            "age_11_14_final_years",
-            "age_15_17_final_years",
-            "age_18_plus_final_years",
-            "age_06_10_high_school",
-            "age_11_14_high_school",
-            "age_15_17_high_school",
-            "age_18_plus_high_school",
-            "total_classes",
-            "classes_final_years",
-            "classes_high_school",
-            "total_classrooms",
-            "error_message",
-        ]
-
-        self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=fieldnames)
-        self._csv_writer.writeheader()
+        self._csv_file = open(
+            self.filename,
+            "w",
+            newline="",
+            encoding="utf-8",
+            buffering=CSV_BUFFER_SIZE,
+        )
+        self._csv_writer = csv.writer(self._csv_file)
+        self._csv_writer.writerow(CSV_FIELDNAMES)
+
+        self._writer_thread = threading.Thread(
+            target=self._drain, name="csv-writer", daemon=True
+        )
+        self._writer_thread.start()
 
         structured_logger.bind_context(
             action="csv_initialized", filename=str(self.filename)
@@ -73,45 +62,77 @@ class CSVStorage:
 
         return str(self.filename)
 
-    def write_school_data(self, school_data: SchoolData):
-        """Write school data to CSV with thread safety."""
+    def submit(self, schools: List[SchoolData]) -> Future:
+        """Queue schools for the writer thread; the future resolves once flushed."""
         if not self._csv_writer:
             raise RuntimeError("CSV file not initialized. Call initialize_csv() first.")
 
-        with self._write_lock:
-            row_data = school_data.to_dict()
-            self._csv_writer.writerow(row_data)
-
-            structured_logger.bind_context(
-                action="school_written",
-                school_name=school_data.name,
-                status=school_data.status.value,
-            ).debug(f"📝 Written school data: {school_data.name}")
-
-    def write_single_school(self, school: SchoolData):
-        """Write a single school data entry to CSV immediately."""
-        self.write_school_data(school)
-        # Force flush to ensure data is written to disk
-        if self._csv_file:
-            self._csv_file.flush()
-
-    def write_multiple_schools(self, schools: List[SchoolData]):
-        """Write multiple school data entries to CSV."""
-        for school in schools:
-            self.write_school_data(school)
-
-        structured_logger.bind_context(action="batch_written", count=len(schools)).info(
-            f"📝 Written {len(schools)} schools to CSV"
-        )
+        future: Future = Future()
+        self._queue.put((schools, future))
+        return future
+
+    def _drain(self):
+        """Write queued chunks in order, flushing once per group of chunks."""
+        while True:
+            item = self._queue.get()
+            group = [item]
+            # Take whatever else is already waiting so it shares the flush
+            while item is not None:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                group.append(item)
+
+            chunks = [chunk for chunk in group if chunk is not None]
+            try:
+                self._write_chunks(chunks)
+            finally:
+                for _ in group:
+                    self._queue.task_done()
+            if item is None:
+                return
+
+    def _write_chunks(self, chunks: list):
+        """Write and flush chunks, resolving the futures nobody has cancelled."""
+        # Claiming a future stops a later cancel() from succeeding; a chunk whose
+        # awaiter was already cancelled (e.g. by Ctrl+C) is still written
+        live = [future.set_running_or_notify_cancel() for _, future in chunks]
+        try:
+            with self._write_lock:
+                for schools, _ in chunks:
+                    self._csv_writer.writerows(map(SchoolData.to_csv_row, schools))
+                self._csv_file.flush()
+        except Exception as e:
+            for (_, future), is_live in zip(chunks, live):
+                if is_live:
+                    future.set_exception(e)
+            return
+
+        for (schools, future), is_live in zip(chunks, live):
+            if is_live:
+                future.set_result(len(schools))
+        if chunks and structured_logger.is_enabled_for("INFO"):
+            count = sum(len(schools) for schools, _ in chunks)
+            structured_logger.bind_context(action="batch_written", count=count).info(
+                "📝 Written {} schools to CSV", count
+            )
+
+    def drain(self):
+        """Block until every queued chunk has been written."""
+        self._queue.join()
 
     def close(self):
-        """Close CSV file with forced flush."""
+        """Stop the writer thread and close the CSV file with forced flush."""
+        if self._writer_thread is not None:
+            self._queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+
         if self._csv_file:
             # Force flush any pending data
             self._csv_file.flush()
             # Ensure data is written to disk
-            import os
-
             os.fsync(self._csv_file.fileno())
             self._csv_file.close()
             structured_logger.bind_context(
@@ -121,10 +142,9 @@ class CSVStorage:
     def force_save(self):
         """Force save all pending data to disk."""
         if self._csv_file:
-            self._csv_file.flush()
-            import os
-
-            os.fsync(self._csv_file.fileno())
+            with self._write_lock:
+                self._csv_file.flush()
+                os.fsync(self._csv_file.fileno())
             structured_logger.bind_context(
                 action="force_save", filename=str(self.filename)
             ).info(f"💾 Force saved data to: {self.filename}")